@@ -1,9 +1,42 @@
+from django.conf.urls import patterns, url
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.core.urlresolvers import reverse
+from django.http import Http404, HttpResponseRedirect, StreamingHttpResponse
 from models import *
+from pq import export
 
 class ChallengeAdmin(admin.ModelAdmin):
     list_display = ['title','author','status','created','started','completed']
     filter_horizontal = ['sets', 'bonuses']
+    actions = ['export_submissions']
+
+    def get_urls(self):
+        urls = patterns('',
+            url(r'^export/$', self.admin_site.admin_view(self.export_view), name='pq_challenge_export'),
+        )
+        return urls + super(ChallengeAdmin, self).get_urls()
+
+    def export_submissions(self, request, queryset):
+        # the admin only returns plain HttpResponses from actions, the
+        # archive is streamed from export_view
+        ids = ','.join('%d' % id for id in queryset.order_by('id').values_list('id', flat=True))
+        return HttpResponseRedirect('%s?ids=%s' % (reverse('admin:pq_challenge_export'), ids))
+    export_submissions.short_description = 'Export submissions as tar.gz'
+
+    def export_view(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        try:
+            ids = [int(id) for id in request.GET.get('ids', '').split(',')]
+        except ValueError:
+            raise Http404
+        challenges = list(Challenge.objects.filter(id__in=ids).order_by('id'))
+        if not challenges:
+            raise Http404
+        response = StreamingHttpResponse(export.iter_archive(challenges), content_type='application/x-gzip')
+        response['Content-Disposition'] = 'attachment; filename=%s' % export.archive_filename(challenges)
+        return response
     
 class SolutionAdmin(admin.ModelAdmin):
     list_display = ['challenge','author','set','attempt','status','generated']
@@ -13,10 +46,35 @@ class SetAdmin(admin.ModelAdmin):
     list_editable = ['title', 'points', 'time_limit']
 
 class BonusAdmin(admin.ModelAdmin):
-    list_display = ['id', 'title', 'description', 'icon', 'points']
+    list_display = ['id', 'title', 'description', 'icon', 'points', 'rule', 'params']
+
+class ScoreAdmin(admin.ModelAdmin):
+    list_display = ['challenge', 'user', 'points', 'bonus_points', 'total', 'updated']
+    list_filter = ['challenge']
+
+class RankingAdmin(admin.ModelAdmin):
+    list_display = ['user', 'total', 'challenges', 'updated']
+    ordering = ['-total']
+
+class PoolStatsAdmin(admin.ModelAdmin):
+    list_display = ['challenge', 'set', 'depth', 'hits', 'misses', 'hit_rate']
+
+class ScriptStatsAdmin(admin.ModelAdmin):
+    list_display = ['path', 'runs', 'failures', 'timeouts', 'mean_elapsed', 'max_elapsed', 'total_cpu', 'max_rss', 'updated']
+    ordering = ['-total_elapsed']
+
+class SlowRequestAdmin(admin.ModelAdmin):
+    list_display = ['path', 'view', 'status', 'total', 'db_time', 'db_queries', 'script_time', 'render_time', 'created']
+    list_filter = ['view']
+    ordering = ['-total']
 
 admin.site.register(Language)    
 admin.site.register(Bonus, BonusAdmin)
 admin.site.register(Set, SetAdmin)
 admin.site.register(Challenge, ChallengeAdmin)
-admin.site.register(Solution, SolutionAdmin)
\ No newline at end of file
+admin.site.register(Solution, SolutionAdmin)
+admin.site.register(PoolStats, PoolStatsAdmin)
+admin.site.register(ScriptStats, ScriptStatsAdmin)
+admin.site.register(SlowRequest, SlowRequestAdmin)
+admin.site.register(Score, ScoreAdmin)
+admin.site.register(Ranking, RankingAdmin)
@@ -0,0 +1,99 @@
+"""
+Content-addressed store for generated inputs and expected outputs.
+
+Blobs are kept gzip-compressed on disk under PQ_BLOB_ROOT, named by the sha1 of
+their uncompressed content, so identical data is only ever stored once. They
+live outside MEDIA_ROOT, since expected outputs must not be downloadable.
+"""
+import gzip
+import hashlib
+import os
+import tempfile
+from django.conf import settings
+
+CHUNK_SIZE = 64 * 1024
+
+
+def root():
+    return getattr(settings, 'PQ_BLOB_ROOT', 'blobs/')
+
+
+def path(digest):
+    return os.path.join(root(), digest[:2], digest[2:] + '.gz')
+
+
+def exists(digest):
+    return os.path.exists(path(digest))
+
+
+def _makedirs(directory):
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+
+
+def put(data):
+    """
+    Store a string. Returns its (digest, size).
+    """
+    digest = hashlib.sha1(data).hexdigest()
+    if not exists(digest):
+        directory = os.path.dirname(path(digest))
+        _makedirs(directory)
+        # write to a temporary file first so readers never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=6) as gz:
+                gz.write(data)
+        os.rename(tmp, path(digest))
+    return digest, len(data)
+
+
+def put_chunks(chunks):
+    """
+    Store content given as a stream of chunks, without holding it in memory.
+    Returns its (digest, size).
+    """
+    _makedirs(root())
+    sha, size = hashlib.sha1(), 0
+    fd, tmp = tempfile.mkstemp(dir=root())
+    with os.fdopen(fd, 'wb') as f:
+        with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=6) as gz:
+            for chunk in chunks:
+                sha.update(chunk)
+                size += len(chunk)
+                gz.write(chunk)
+    digest = sha.hexdigest()
+    if exists(digest):
+        os.remove(tmp)
+    else:
+        _makedirs(os.path.dirname(path(digest)))
+        os.rename(tmp, path(digest))
+    return digest, size
+
+
+def open(digest):
+    """
+    Open a blob for streaming reads of its uncompressed content.
+    """
+    return gzip.open(path(digest), 'rb')
+
+
+def read(digest):
+    with open(digest) as f:
+        return f.read()
+
+
+def iter_chunks(digest, chunk_size=CHUNK_SIZE):
+    """
+    Yield the uncompressed content of a blob in fixed size chunks.
+    """
+    with open(digest) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
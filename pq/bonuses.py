@@ -0,0 +1,127 @@
+"""
+Bonus rules.
+
+Each bonus has a rule type, one of models.BONUS_RULE_CHOICES, and JSON
+parameters, for example a "deadline" bonus with {"set": 2, "seconds": 65}.
+The "set" parameter limits a rule to solutions of one set; without it the
+rule applies to every set. Manual bonuses are never awarded automatically.
+
+A rule gets the solution and its parameters, plus the first completed
+solution of each set when it needs to know about other solutions, and
+returns whether the bonus is earned.
+"""
+import json
+from datetime import timedelta
+from django.db.models import Min
+from pq.models import Solution
+from pq import caching
+
+SolutionBonus = Solution.bonuses.through
+
+
+def deadline(solution, params, first):
+    return solution.submitted < solution.generated + timedelta(seconds=params['seconds'])
+
+
+def earlybird(solution, params, first):
+    return solution.challenge.started is not None and solution.submitted < solution.challenge.started + timedelta(hours=params['hours'])
+
+
+def first_solution(solution, params, first):
+    return first.get(solution.set_id) == solution.id
+
+
+RULES = {
+    'deadline': deadline,
+    'earlybird': earlybird,
+    'first': first_solution,
+}
+
+
+def get_params(bonus):
+    return json.loads(bonus.params) if bonus.params else {}
+
+
+def get_rules(challenge):
+    """
+    List of (bonus id, rule, params) for the automatic bonuses of a
+    challenge.
+    """
+    rules = []
+    for bonus in caching.get_bonuses(challenge):
+        if bonus.rule != 'manual':
+            rules.append((bonus.id, RULES[bonus.rule], get_params(bonus)))
+    return rules
+
+
+def needs_first(rules):
+    return any(rule is first_solution for bonus_id, rule, params in rules)
+
+
+def first_solutions(challenge, solutions=None):
+    """
+    Map of set id to the id of the first completed solution of that set. If
+    solutions is given, only the sets of those solutions are looked up.
+    """
+    qs = challenge.solution_set.filter(status=2)
+    if solutions is not None:
+        qs = qs.filter(set__in=set(s.set_id for s in solutions))
+    first_times = dict(qs.values_list('set').annotate(Min('submitted')))
+    if not first_times:
+        return {}
+    first = {}
+    for id, set_id, submitted in qs.filter(submitted__in=first_times.values()).order_by('-id').values_list(
+            'id', 'set', 'submitted'):
+        if first_times[set_id] == submitted:
+            first[set_id] = id
+    return first
+
+
+def evaluate(solution, rules, first):
+    """
+    Ids of the bonuses a completed solution earns.
+    """
+    earned = []
+    for bonus_id, rule, params in rules:
+        if 'set' in params and params['set'] != solution.set_id:
+            continue
+        if rule(solution, params, first):
+            earned.append(bonus_id)
+    return earned
+
+
+def apply(solution):
+    """
+    Award the bonuses a solution earns. Call this after the solution is
+    completed.
+    """
+    rules = [r for r in get_rules(solution.challenge) if r[2].get('set', solution.set_id) == solution.set_id]
+    if not rules:
+        return []
+    first = first_solutions(solution.challenge, [solution]) if needs_first(rules) else {}
+    earned = evaluate(solution, rules, first)
+    if earned:
+        solution.bonuses.add(*earned)
+    return earned
+
+
+def rescore(challenge):
+    """
+    Re-evaluate the automatic bonuses of every completed solution of a
+    challenge. Manual bonuses are left alone. Returns the number of bonuses
+    awarded.
+    """
+    rules = get_rules(challenge)
+    first = first_solutions(challenge) if needs_first(rules) else {}
+
+    rows = []
+    for solution in challenge.solution_set.filter(status=2):
+        solution.challenge = challenge
+        for bonus_id in evaluate(solution, rules, first):
+            rows.append(SolutionBonus(solution_id=solution.id, bonus_id=bonus_id))
+
+    automatic = challenge.bonuses.exclude(rule='manual')
+    SolutionBonus.objects.filter(solution__challenge=challenge, bonus__in=automatic).delete()
+    SolutionBonus.objects.bulk_create(rows)
+    caching.invalidate_progress()
+    return len(rows)
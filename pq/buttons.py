@@ -1,9 +1,13 @@
+import itertools
 from django.core.urlresolvers import reverse
+from pq import caching
 
 class Button(object):
     def __init__(self, challenge, set, sol):
         self.set = set
         self.sol = sol 
+        # changes whenever the button needs to be redrawn, see pq.js
+        self.state = '%s-%d' % (self.__class__.__name__, sol.attempt if sol else 0)
         self.icon = 'icon-time'
         self.action = '',
         self.classes = ('', '')
@@ -44,6 +48,18 @@ class CompletedButton(Button):
         self.classes = ('btn-success', 'btn-success')
         self.icon = 'icon-ok icon-white'
 
+class GeneratingButton(Button):
+    """
+    input still being generated button
+    """
+    def __init__(self, challenge, *args, **kwargs):
+        super(GeneratingButton, self).__init__(challenge, *args, **kwargs)
+        self.action = 'Generating input...'
+        self.classes = ('btn-info btn-refresh', 'btn-inverse')
+        self.icon = 'icon-time icon-white'
+        self.time = self.set.get_time_limit()
+        self.url = reverse('pq.views.solution_begin', args=[challenge.id, self.set.id])
+
 class ExpiredButton(Button):
     """
     expired set button
@@ -91,4 +107,53 @@ class OpenButton(Button):
         self.icon = 'icon-time icon-white'
         self.time = self.set.get_time_limit()
         self.url = reverse('pq.views.solution_begin', args=[challenge.id, self.set.id])
-    
\ No newline at end of file
+
+
+def get_buttons(challenge, user, progress=None):
+    """
+    Build the list of set buttons of a challenge for a user, from their
+    progress (see pq.progress).
+    """
+    if progress is None:
+        progress = caching.get_progress(challenge, user)
+    sets, solutions = progress.sets, progress.solutions
+    set_buttons = []
+
+    # sets are open up to the first one past the highest completed set
+    open_sets = []
+    for set in sets:
+        open_sets.append(set.id)
+        if set.id > progress.max_set:
+            break
+
+    # zipping sets and solutions together, generate a list of buttons to display along the right.
+    # there are different buttons for all sorts of state combinations
+    for set, sol in itertools.izip_longest(sets, solutions):
+        
+        if not user.is_authenticated():
+            b = LoginButton(challenge, set, sol)
+        
+        elif not sol and set.id not in open_sets:            
+            b = LockedButton(challenge, set, sol)
+        
+        elif sol and sol.status == 2:            
+            b = CompletedButton(challenge, set, sol)
+
+        elif sol and not sol.generated:
+            b = GeneratingButton(challenge, set, sol)
+
+        elif sol and sol.is_expired():
+            b = ExpiredButton(challenge, set, sol)
+
+        elif sol and set.time_limit > 0:
+            b = RunningButton(challenge, set, sol)
+
+        elif sol:            
+            b = RunningUnlimitedButton(challenge, set, sol)            
+    
+        else:
+            b = OpenButton(challenge, set, sol)            
+
+        set_buttons.append(b)
+
+    return set_buttons
@@ -0,0 +1,191 @@
+"""
+Cached data for the challenge sidebar, which is rendered on every page, and
+for the pages of the challenge archive.
+
+The challenge lists and archive pages are dropped whenever a challenge is
+saved or deleted, and a user's score map whenever one of their solutions is
+completed. Rebuilding the scoreboards drops every score map at once by
+bumping a version number. The bonuses of each challenge are cached for the
+bonus rule engine, and dropped together whenever any bonus changes. The
+progress of each user in a challenge is dropped when one of their solutions
+changes, and all of them when a challenge, its sets or the awarded bonuses
+change in bulk. Progress with an input still being generated is not cached.
+
+Invalidation only reaches other processes, like genworker or the management
+commands, through a cache they share (see local_settings.py.sample).
+"""
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from pq.models import Challenge, Score, Bonus, Solution
+from pq import progress
+from pq.signals import solution_completed
+
+CHALLENGES_KEY = 'pq:challenges:%d'
+CHALLENGE_PAGE_KEY = 'pq:challenges:page:%d:%d:%d'
+CHALLENGES_VERSION_KEY = 'pq:challenges:version'
+SCORES_KEY = 'pq:scores:%d:%d'
+SCORES_VERSION_KEY = 'pq:scores:version'
+BONUSES_KEY = 'pq:bonuses:%d:%d'
+BONUSES_VERSION_KEY = 'pq:bonuses:version'
+PROGRESS_KEY = 'pq:progress:%d:%d:%d'
+PROGRESS_VERSION_KEY = 'pq:progress:version'
+
+
+def get_challenges(size):
+    """
+    Challenges listed in the sidebar (size 1) or on the challenge page (size 0).
+    """
+    key = CHALLENGES_KEY % size
+    challenges = cache.get(key)
+    if challenges is None:
+        if size == 0:
+            challenges = Challenge.objects.filter(status__gte=2).order_by('-started')
+        else:
+            challenges = Challenge.objects.filter(status=2).order_by('-started')
+        challenges = list(challenges)
+        cache.set(key, challenges)
+    return challenges
+
+
+def older_than(challenge):
+    """
+    Filter for the challenges after one in the archive order, newest start
+    first, then highest id, with unstarted challenges last.
+    """
+    if challenge.started is None:
+        return Q(started=None, id__lt=challenge.id)
+    return (Q(started__lt=challenge.started) | Q(started=challenge.started, id__lt=challenge.id) |
+        Q(started=None))
+
+
+def get_challenge_page(before=0, count=20):
+    """
+    A page of the challenge archive: (challenges, more), with the count
+    challenges that follow the one with id before, or the newest ones, and
+    whether there are more after them. Raises Challenge.DoesNotExist for an
+    unknown before.
+    """
+    version = cache.get(CHALLENGES_VERSION_KEY, 0)
+    key = CHALLENGE_PAGE_KEY % (version, before, count)
+    page = cache.get(key)
+    if page is None:
+        challenges = Challenge.objects.filter(status__gte=2).order_by('-started', '-id')
+        if before:
+            challenges = challenges.filter(older_than(challenges.get(id=before)))
+        challenges = list(challenges[:count + 1])
+        page = challenges[:count], len(challenges) > count
+        cache.set(key, page)
+    return page
+
+
+def get_scores(user):
+    """
+    Map of challenge id to the user's total in that challenge.
+    """
+    version = cache.get(SCORES_VERSION_KEY, 0)
+    key = SCORES_KEY % (version, user.id)
+    scores = cache.get(key)
+    if scores is None:
+        scores = dict(Score.objects.filter(user=user).values_list('challenge', 'total'))
+        cache.set(key, scores)
+    return scores
+
+
+def get_bonuses(challenge):
+    """
+    Bonuses that can be earned in a challenge.
+    """
+    version = cache.get(BONUSES_VERSION_KEY, 0)
+    key = BONUSES_KEY % (version, challenge.id)
+    bonuses = cache.get(key)
+    if bonuses is None:
+        bonuses = list(challenge.bonuses.order_by('id'))
+        cache.set(key, bonuses)
+    return bonuses
+
+
+def get_progress(challenge, user):
+    """
+    Progress of a user in a challenge, see pq.progress.
+    """
+    version = cache.get(PROGRESS_VERSION_KEY, 0)
+    key = PROGRESS_KEY % (version, challenge.id, user.id or 0)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = progress.load(challenge, user)
+        # an input being generated is finished by genworker, whose
+        # invalidation may not reach this process's cache
+        if all(solution.generated for solution in snapshot.solutions):
+            cache.set(key, snapshot)
+    return snapshot
+
+
+def invalidate_challenges():
+    cache.delete_many([CHALLENGES_KEY % 0, CHALLENGES_KEY % 1])
+    cache.set(CHALLENGES_VERSION_KEY, cache.get(CHALLENGES_VERSION_KEY, 0) + 1)
+
+
+def invalidate_scores(user_id=None):
+    """
+    Drop the score map of a user, or of every user.
+    """
+    version = cache.get(SCORES_VERSION_KEY, 0)
+    if user_id is None:
+        cache.set(SCORES_VERSION_KEY, version + 1)
+    else:
+        cache.delete(SCORES_KEY % (version, user_id))
+
+
+def invalidate_bonuses():
+    cache.set(BONUSES_VERSION_KEY, cache.get(BONUSES_VERSION_KEY, 0) + 1)
+
+
+def invalidate_progress(challenge_id=None, user_id=None):
+    """
+    Drop the progress of a user in a challenge, or of everybody.
+    """
+    version = cache.get(PROGRESS_VERSION_KEY, 0)
+    if challenge_id is None:
+        cache.set(PROGRESS_VERSION_KEY, version + 1)
+    else:
+        cache.delete(PROGRESS_KEY % (version, challenge_id, user_id))
+
+
+@receiver(post_save, sender=Challenge)
+@receiver(post_delete, sender=Challenge)
+def challenge_changed(sender, **kwargs):
+    invalidate_challenges()
+    invalidate_progress()
+
+
+@receiver(m2m_changed, sender=Challenge.sets.through)
+def challenge_sets_changed(sender, **kwargs):
+    invalidate_progress()
+
+
+@receiver(post_save, sender=Solution)
+@receiver(post_delete, sender=Solution)
+def solution_saved(sender, instance, **kwargs):
+    invalidate_progress(instance.challenge_id, instance.author_id)
+
+
+@receiver(m2m_changed, sender=Solution.bonuses.through)
+def solution_bonuses_changed(sender, instance, **kwargs):
+    if isinstance(instance, Solution):
+        invalidate_progress(instance.challenge_id, instance.author_id)
+    else:
+        invalidate_progress()
+
+
+@receiver(solution_completed)
+def solution_changed(sender, solution, **kwargs):
+    invalidate_scores(solution.author_id)
+
+
+@receiver(post_save, sender=Bonus)
+@receiver(post_delete, sender=Bonus)
+@receiver(m2m_changed, sender=Challenge.bonuses.through)
+def bonus_changed(sender, **kwargs):
+    invalidate_bonuses()
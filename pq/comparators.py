@@ -0,0 +1,156 @@
+"""
+Output comparators.
+
+Each challenge picks the comparator used to judge uploaded outputs. A
+comparator gets the uploaded file and the expected output file, and returns
+an error message for the first difference it finds, or None if the output is
+correct. The numeric comparators need numpy, which is only imported when they
+are used.
+"""
+from collections import Counter
+from itertools import imap, islice, izip_longest
+from pq import verify
+
+# numbers compared at once by the float comparator
+BLOCK_SIZE = 64 * 1024
+
+COMPARATORS = {}
+COMPARATOR_CHOICES = []
+
+
+def register(name, label):
+    def decorator(cls):
+        cls.name = name
+        COMPARATORS[name] = cls
+        COMPARATOR_CHOICES.append((name, label))
+        return cls
+    return decorator
+
+
+def get(challenge):
+    return COMPARATORS[challenge.comparator](challenge)
+
+
+def iter_rows(f):
+    """
+    Yield the whitespace separated values of each non-blank line of a file.
+    """
+    for line in verify.iter_lines(verify.iter_chunks(f)):
+        row = line.split()
+        if row:
+            yield row
+
+
+def iter_values(f):
+    for row in iter_rows(f):
+        for value in row:
+            yield value
+
+
+class Comparator(object):
+    # whether a matching normalized digest proves the output correct
+    digest_fast_path = False
+
+    def __init__(self, challenge):
+        self.tolerance = challenge.tolerance
+
+    def compare(self, output_file, expected_file):
+        raise NotImplementedError
+
+
+@register('exact', 'Exact lines')
+class ExactComparator(Comparator):
+    """
+    Lines must match exactly, apart from surrounding whitespace.
+    """
+    digest_fast_path = True
+
+    def compare(self, output_file, expected_file):
+        line = verify.verify(output_file, expected_file)
+        if line:
+            return 'Your output failed on line %d!' % line
+
+
+@register('token', 'Tokens')
+class TokenComparator(Comparator):
+    """
+    Lines must contain the same whitespace separated tokens.
+    """
+    def compare(self, output_file, expected_file):
+        output = verify.iter_lines(verify.iter_chunks(output_file))
+        expected = verify.iter_lines(verify.iter_chunks(expected_file))
+        for i, (a, b) in enumerate(izip_longest(output, expected, fillvalue='')):
+            if a.split() != b.split():
+                return 'Your output failed on line %d!' % (i + 1)
+
+
+@register('float', 'Numbers within tolerance')
+class FloatComparator(Comparator):
+    """
+    All whitespace separated values are compared as numbers, with the
+    challenge tolerance as both relative and absolute tolerance.
+    """
+    def compare(self, output_file, expected_file):
+        import numpy
+        output, expected = iter_values(output_file), iter_values(expected_file)
+        offset = 0
+        while True:
+            b = numpy.fromiter(imap(float, islice(expected, BLOCK_SIZE)), dtype=float)
+            try:
+                a = numpy.fromiter(imap(float, islice(output, BLOCK_SIZE)), dtype=float)
+            except ValueError:
+                return 'Your output contains something that is not a number!'
+            if a.size != b.size:
+                return 'Your output has %d values, expected %d!' % (
+                    offset + a.size + sum(1 for value in output), offset + b.size + sum(1 for value in expected))
+            wrong = numpy.flatnonzero(~numpy.isclose(a, b, rtol=self.tolerance, atol=self.tolerance))
+            if wrong.size:
+                return 'Your output failed on value %d!' % (offset + wrong[0] + 1)
+            if b.size < BLOCK_SIZE:
+                return None
+            offset += b.size
+
+
+@register('unordered', 'Lines in any order')
+class UnorderedComparator(Comparator):
+    """
+    The output must contain the same lines as the expected output, in any
+    order. Blank lines are ignored.
+    """
+    def lines(self, f):
+        lines = verify.iter_lines(verify.iter_chunks(f))
+        return sorted(line for line in (l.strip() for l in lines) if line)
+
+    def compare(self, output_file, expected_file):
+        output, expected = self.lines(output_file), self.lines(expected_file)
+        if output == expected:
+            return None
+        missing = Counter(expected) - Counter(output)
+        if missing:
+            return 'Your output is missing the line "%s"!' % min(missing)
+        return 'Your output has an unexpected line "%s"!' % min(Counter(output) - Counter(expected))
+
+
+@register('grid', 'Grid')
+class GridComparator(Comparator):
+    """
+    Outputs are grids of whitespace separated cells, one row per line. Row
+    indentation is ignored, which is how hex grids are usually printed.
+    """
+    def compare(self, output_file, expected_file):
+        rows = izip_longest(iter_rows(output_file), iter_rows(expected_file))
+        error = None
+        output_rows = expected_rows = 0
+        for i, (output, expected) in enumerate(rows):
+            output_rows += output is not None
+            expected_rows += expected is not None
+            if error or output is None or expected is None:
+                continue
+            if len(output) != len(expected):
+                error = 'Your output has %d cells on row %d, expected %d!' % (len(output), i + 1, len(expected))
+            elif output != expected:
+                col = next(j for j, (a, b) in enumerate(zip(output, expected)) if a != b)
+                error = 'Your output failed on row %d, column %d!' % (i + 1, col + 1)
+        if output_rows != expected_rows:
+            return 'Your output has %d rows, expected %d!' % (output_rows, expected_rows)
+        return error
@@ -0,0 +1,149 @@
+"""
+SQLite production profile.
+
+Three independent pieces, all off by default:
+
+- PQ_SQLITE_PRAGMAS are run on every new SQLite connection, to turn on WAL
+  so that readers don't wait for writers, and to tune syncing and caching.
+- With PQ_PERSISTENT_CONNECTIONS, connections are kept open across requests
+  instead of being closed when each request finishes.
+- With a 'replica' entry in DATABASES, ReplicaRouter sends the reads made
+  inside replica() to that database, a copy of the main one refreshed by
+  `manage.py refresh_replica`. The scoreboards read from it, so they don't
+  compete with solution uploads. Cached data is not read from it, as a
+  stale copy would stay in the cache after the invalidation meant to drop
+  it. Until the first refresh, reads go to the main database.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+from django.core import signals
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+PRAGMAS = getattr(settings, 'PQ_SQLITE_PRAGMAS', ())
+PERSISTENT_CONNECTIONS = getattr(settings, 'PQ_PERSISTENT_CONNECTIONS', False)
+REPLICA = 'replica'
+
+local = threading.local()
+
+
+@contextmanager
+def replica():
+    """
+    Send the reads inside to the read replica, if there is one.
+    """
+    old = getattr(local, 'replica', False)
+    local.replica = True
+    try:
+        yield
+    finally:
+        local.replica = old
+
+
+def has_replica():
+    return REPLICA in settings.DATABASES
+
+
+def replica_ready():
+    """
+    Whether there is a replica, and it has been refreshed at least once.
+    """
+    if not has_replica():
+        return False
+    try:
+        return os.path.getsize(settings.DATABASES[REPLICA]['NAME']) > 0
+    except OSError:
+        return False
+
+
+class ReplicaRouter(object):
+    """
+    Reads inside replica() go to the replica, everything else, and every
+    write, to the main database.
+    """
+    def db_for_read(self, model, **hints):
+        if getattr(local, 'replica', False) and replica_ready():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        # objects read from the replica are saved to the main database
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_syncdb(self, db, model):
+        return db != REPLICA
+
+
+def refresh_replica():
+    """
+    Copy the main database over the replica. The copy is written next to the
+    replica and renamed into place, so readers never see a partial file.
+    Needs SQLite 3.27 for VACUUM INTO.
+    """
+    path = settings.DATABASES[REPLICA]['NAME']
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    cursor = connections[DEFAULT_DB_ALIAS].cursor()
+    cursor.execute('VACUUM INTO %s', [tmp])
+    os.rename(tmp, path)
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    cursor = connection.connection.cursor()
+    if connection.alias == REPLICA:
+        # the replica is only ever replaced as a whole
+        cursor.execute('PRAGMA query_only = ON')
+        connection.replica_inode = os.stat(connection.settings_dict['NAME']).st_ino
+    else:
+        for name, value in PRAGMAS:
+            cursor.execute('PRAGMA %s = %s' % (name, value))
+    cursor.close()
+
+
+@receiver(signals.request_started)
+def reopen_replica(sender, **kwargs):
+    # a persistent connection would keep reading a replica file that has
+    # been replaced
+    if has_replica():
+        connection = connections[REPLICA]
+        if connection.connection is not None:
+            try:
+                inode = os.stat(connection.settings_dict['NAME']).st_ino
+            except OSError:
+                inode = None
+            if inode != getattr(connection, 'replica_inode', None):
+                connection.close()
+
+
+def end_request(**kwargs):
+    """
+    Roll back whatever a request left uncommitted, like Django does before
+    closing the connections, but keep them open.
+    """
+    from django.db import transaction
+    for alias in connections:
+        transaction.abort(alias)
+
+
+def keep_connections():
+    # this module is loaded while django.db is still being set up, so this
+    # is called from pq.models
+    from django.db import close_connection
+    signals.request_finished.disconnect(close_connection)
+    signals.request_finished.connect(end_request)
+
+
+def close_connections():
+    from django.db import close_connection
+    signals.request_finished.disconnect(end_request)
+    signals.request_finished.connect(close_connection)
@@ -0,0 +1,134 @@
+"""
+Archives of challenge submissions.
+
+iter_archive() yields a tar.gz of one or more challenges as it is built: the
+sources and outputs of every solution, a scoreboard.csv and a solutions.csv
+per challenge. Files are read in chunks and compressed on the way, so there
+are no temporary files and memory use doesn't grow with the number of
+solutions. It backs the "Export submissions" admin action and the
+export_challenge command.
+"""
+import csv
+import gzip
+import os
+import tarfile
+import time
+from StringIO import StringIO
+from pq.models import Solution
+from pq import serving
+from pq.scoreboard import get_scoreboard
+
+NUL = '\0'
+
+
+class Pipe(object):
+    """
+    Write-only file that keeps what is written until it is drained.
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = ''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_tar_gz(members):
+    """
+    Yield a tar.gz of members, given as (name, size, mtime, chunks) tuples.
+    """
+    pipe = Pipe()
+    gz = gzip.GzipFile(fileobj=pipe, mode='wb')
+    for name, size, mtime, chunks in members:
+        info = tarfile.TarInfo(name)
+        info.size, info.mtime, info.mode = size, int(mtime), 0644
+        gz.write(info.tobuf())
+        for chunk in chunks:
+            gz.write(chunk)
+            data = pipe.drain()
+            if data:
+                yield data
+        gz.write(NUL * (-size % tarfile.BLOCKSIZE))
+    # the end of archive marker
+    gz.write(NUL * 2 * tarfile.BLOCKSIZE)
+    gz.close()
+    yield pipe.drain()
+
+
+def csv_member(name, rows):
+    out = StringIO()
+    writer = csv.writer(out)
+    for row in rows:
+        writer.writerow([unicode(value).encode('utf-8') for value in row])
+    data = out.getvalue()
+    return name, len(data), time.time(), [data]
+
+
+def scoreboard_rows(challenge):
+    yield ['rank', 'user', 'points', 'bonus_points', 'total']
+    rank = 0
+    previous = None
+    for i, score in enumerate(get_scoreboard(challenge)):
+        if score.total != previous:
+            rank, previous = i + 1, score.total
+        yield [rank, score.user.username, score.points, score.bonus_points, score.total]
+
+
+def solutions(challenge):
+    return (Solution.objects.filter(challenge=challenge).select_related('author', 'set')
+        .order_by('author__username', 'set').iterator())
+
+
+def member_name(prefix, field):
+    """
+    Name of an uploaded file in the archive, or '' if there is no file.
+    """
+    if field and os.path.isfile(field.path):
+        # the same layout as under MEDIA_ROOT
+        return '%s/%s' % (prefix, field.name)
+    return ''
+
+
+def solution_rows(challenge, prefix):
+    yield ['id', 'user', 'set', 'status', 'attempt', 'generated', 'submitted', 'source', 'output']
+    for solution in solutions(challenge):
+        yield [solution.id, solution.author.username, solution.set.title, solution.get_status_display(),
+            solution.attempt, solution.generated or '', solution.submitted or '',
+            member_name(prefix, solution.source), member_name(prefix, solution.output_user)]
+
+
+def challenge_members(challenge):
+    """
+    Archive members of a challenge, under challenge-<id>/.
+    """
+    prefix = 'challenge-%d' % challenge.id
+    yield csv_member('%s/scoreboard.csv' % prefix, scoreboard_rows(challenge))
+    for solution in solutions(challenge):
+        for field in (solution.source, solution.output_user):
+            name = member_name(prefix, field)
+            if name:
+                stat = os.stat(field.path)
+                yield name.encode('utf-8'), stat.st_size, stat.st_mtime, serving.iter_file(field.path)
+    yield csv_member('%s/solutions.csv' % prefix, solution_rows(challenge, prefix))
+
+
+def iter_archive(challenges):
+    """
+    Yield a tar.gz of the submissions of some challenges.
+    """
+    def members():
+        for challenge in challenges:
+            for member in challenge_members(challenge):
+                yield member
+    return iter_tar_gz(members())
+
+
+def archive_filename(challenges):
+    return 'pq-%s.tar.gz' % '-'.join('%d' % c.id for c in challenges)
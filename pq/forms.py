@@ -1,19 +1,26 @@
 from django import forms
+from django.conf import settings
 from pq.models import Challenge, Solution, Bonus, Set
+from pq import comparators, seeds, verify
 from django.template.defaultfilters import filesizeformat
 from django.utils.translation import ugettext_lazy as _
 
 CONTENT_TYPES = ['text', 'application']
-MAX_UPLOAD_SIZE = 102400 # 2.5MB - 2621440
+MAX_UPLOAD_SIZE = getattr(settings, 'PQ_MAX_UPLOAD_SIZE', 1073741824) # 1GB
+MAX_SOURCE_SIZE = 102400 # 100KB
 
 class SolutionForm(forms.ModelForm):
     class Meta:
         model = Solution
         fields = ['output_user', 'source']
 
+    def __init__(self, *args, **kwargs):
+        # normalized digest of the output, if it was computed during the upload
+        self.output_digest = kwargs.pop('output_digest', None)
+        super(SolutionForm, self).__init__(*args, **kwargs)
+
     def clean(self):
         cleaned_data = super(SolutionForm, self).clean()
-        output_gen = self.instance.output_gen
         output_user = cleaned_data.get('output_user')
         source = cleaned_data.get('source')
         source_req = self.instance.challenge.source_req
@@ -25,24 +32,32 @@ class SolutionForm(forms.ModelForm):
             raise forms.ValidationError('No source code provided.')
 
         if source_req:
-            files = [output_user, source]
+            files = [(output_user, MAX_UPLOAD_SIZE), (source, MAX_SOURCE_SIZE)]
         else:
-            files = [output_user]
+            files = [(output_user, MAX_UPLOAD_SIZE)]
 
-        for f in files:
+        for f, max_size in files:
             content_type = f.content_type.split('/')[0]
             if content_type in CONTENT_TYPES:
-                print f._size
-                if int(f._size) > MAX_UPLOAD_SIZE:
-                    raise forms.ValidationError('Filesize exceeds %s.' % filesizeformat(MAX_UPLOAD_SIZE))
+                if int(f.size) > max_size:
+                    raise forms.ValidationError('Filesize exceeds %s.' % filesizeformat(max_size))
             else:            
                 raise forms.ValidationError('File type is not supported!')
-            
-        for i,(a,b) in enumerate(map(None, output_user, output_gen.splitlines())):
-            a = a.strip() if a else ''
-            b = b.strip() if b else ''
-            if a != b:                
-                raise forms.ValidationError('Your output failed on line %d!' % (i+1))
-                # raise forms.ValidationError('Your output was incorrect.')
+
+        comparator = comparators.get(self.instance.challenge)
+
+        # matching digests mean a correct output, only compare on a mismatch
+        if comparator.digest_fast_path:
+            output_digest = self.output_digest or verify.line_digest(verify.iter_chunks(output_user))
+            if output_digest == self.instance.output_check:
+                return cleaned_data
+
+        try:
+            with self.instance.open_output() as output_gen:
+                error = comparator.compare(output_user, output_gen)
+        except seeds.SeedMismatch:
+            raise forms.ValidationError('Your input can no longer be reproduced, please download a new one.')
+        if error:
+            raise forms.ValidationError(error)
 
         return cleaned_data
\ No newline at end of file
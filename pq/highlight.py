@@ -0,0 +1,59 @@
+"""
+Syntax highlighting of solution sources.
+
+Sources are highlighted with Pygments when they are uploaded, and the HTML is
+cached by content hash and lexer, so solution pages ship highlighted markup
+instead of highlighting in the browser. The lexer comes from the extension
+of the solution's language, or of the source file name. The styles are in
+static/pygments.css.
+"""
+import os
+import re
+from django.conf import settings
+from django.core.cache import cache
+
+TIMEOUT = getattr(settings, 'PQ_HIGHLIGHT_TIMEOUT', 7 * 24 * 3600)
+HTML_KEY = 'pq:highlight:%s:%s'
+CSS_CLASS = 'highlight'
+
+
+def get_lexer(extension, source):
+    from pygments.lexers import get_lexer_for_filename, TextLexer
+    from pygments.util import ClassNotFound
+    try:
+        return get_lexer_for_filename('source.%s' % extension, source, stripnl=False)
+    except ClassNotFound:
+        return TextLexer(stripnl=False)
+
+
+def highlight(source, extension):
+    """
+    Highlighted HTML of a source string, with line numbers.
+    """
+    from pygments import highlight as pygmentize
+    from pygments.formatters import HtmlFormatter
+    return pygmentize(source, get_lexer(extension, source), HtmlFormatter(cssclass=CSS_CLASS, linenos='table'))
+
+
+def get_extension(solution):
+    if solution.language_id:
+        extension = solution.language.extension
+    else:
+        extension = os.path.splitext(solution.source.name)[1]
+    return re.sub(r'\W', '', extension).lower()
+
+
+def solution_html(solution):
+    """
+    Highlighted source of a solution, from the cache if it was highlighted
+    before.
+    """
+    extension = get_extension(solution)
+    key = HTML_KEY % (solution.source_digest, extension)
+    html = cache.get(key)
+    if html is None:
+        with open(solution.source.path, 'rb') as f:
+            source = f.read().decode('utf-8', 'replace')
+        html = highlight(source, extension)
+        cache.set(key, html, TIMEOUT)
+    return html
@@ -0,0 +1,99 @@
+"""
+Queue of input generation jobs.
+
+With PQ_ASYNC_GENERATION enabled, solution_begin hands slow generation off to
+this queue instead of blocking the request. The queue lives in the regular
+database, and is worked off by the `genworker` management command. A job left
+running for longer than PQ_JOB_TIMEOUT seconds belongs to a worker that died,
+and is failed so that the solution can ask for a new one.
+"""
+import traceback
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db.models import Q
+from pq.models import GenerationJob
+from pq import pool
+
+ASYNC_GENERATION = getattr(settings, 'PQ_ASYNC_GENERATION', False)
+JOB_TIMEOUT = getattr(settings, 'PQ_JOB_TIMEOUT', 600)
+
+
+def stale_before():
+    return datetime.now() - timedelta(seconds=JOB_TIMEOUT)
+
+
+def enqueue(solution):
+    """
+    Start generating a new input for a solution. Pooled inputs are handed out
+    right away as a finished job, otherwise a job is queued. A solution only
+    ever has one pending job.
+    """
+    if solution.id:
+        pending = (solution.generationjob_set.filter(Q(status=0) | Q(status=1, started__gte=stale_before()))
+            .order_by('id'))
+        if pending:
+            return pending[0]
+
+    entry = pool.take(solution.challenge, solution.set)
+    if entry:
+        pool.record(solution.challenge, solution.set, True)
+        solution.generate(entry)
+        solution.save()
+        return GenerationJob.objects.create(solution=solution, status=2, finished=datetime.now())
+
+    # the timer does not run while the input is being generated
+    solution.generated = None
+    solution.save()
+    return GenerationJob.objects.create(solution=solution)
+
+
+def claim():
+    """
+    Claim the oldest queued job. Returns None if the queue is empty.
+    """
+    for job in GenerationJob.objects.filter(status=0).order_by('id')[:5]:
+        # only one worker can move the job out of the queued state
+        now = datetime.now()
+        if GenerationJob.objects.filter(id=job.id, status=0).update(status=1, started=now):
+            job.status, job.started = 1, now
+            return job
+    return None
+
+
+def fail_stale():
+    """
+    Fail the jobs whose worker died while running them. Returns their number.
+    """
+    return GenerationJob.objects.filter(status=1, started__lt=stale_before()).update(status=3,
+        finished=datetime.now(), error='Timed out after %d seconds.' % JOB_TIMEOUT)
+
+
+def run(job):
+    """
+    Generate the input for a claimed job.
+    """
+    solution = job.solution
+    try:
+        pool.generate(solution)
+        solution.save()
+        job.status = 2
+    except Exception:
+        job.status = 3
+        job.error = traceback.format_exc()
+    job.finished = datetime.now()
+    job.save()
+    return job
+
+
+def run_pending():
+    """
+    Work off the queue until it is empty. Returns the number of jobs run.
+    """
+    fail_stale()
+    n = 0
+    job = claim()
+    while job:
+        run(job)
+        n += 1
+        job = claim()
+    return n
@@ -0,0 +1,46 @@
+from django.core.management.base import NoArgsCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import get_app, get_models
+
+
+class Command(NoArgsCommand):
+    help = ('Add the columns of fields that are missing from existing tables, which syncdb '
+            'leaves alone. New columns get the field default.')
+
+    def handle_noargs(self, **options):
+        cursor = connection.cursor()
+        tables = connection.introspection.table_names()
+        added = []
+        with transaction.commit_on_success():
+            for model in get_models(get_app('pq')):
+                table = model._meta.db_table
+                if table not in tables:
+                    continue
+                columns = [c[0] for c in connection.introspection.get_table_description(cursor, table)]
+                for field in model._meta.local_fields:
+                    if field.column not in columns:
+                        cursor.execute(self.add_column_sql(table, field))
+                        added.append('%s.%s' % (table, field.column))
+        for column in added:
+            self.stdout.write('Added %s.' % column)
+        self.stdout.write('Added %d columns.' % len(added))
+
+    def add_column_sql(self, table, field):
+        qn = connection.ops.quote_name
+        sql = 'ALTER TABLE %s ADD COLUMN %s %s' % (qn(table), qn(field.column), field.db_type(connection))
+        default = field.get_db_prep_save(field.get_default(), connection)
+        if default is None:
+            if not field.null:
+                raise CommandError('%s.%s has no default to fill existing rows with.' % (table, field.column))
+            return sql
+        if not field.null:
+            sql += ' NOT NULL'
+        return sql + ' DEFAULT %s' % self.literal(default)
+
+    def literal(self, value):
+        # ALTER TABLE takes no query parameters
+        if isinstance(value, bool):
+            return '%d' % value
+        if isinstance(value, (int, long, float)):
+            return repr(value)
+        return "'%s'" % unicode(value).replace("'", "''")
@@ -0,0 +1,54 @@
+import random
+import time
+from StringIO import StringIO
+from optparse import make_option
+from django.core.management.base import NoArgsCommand, CommandError
+from pq import comparators
+
+
+class Challenge(object):
+    # stand-in for a challenge, comparators only look at the tolerance
+    tolerance = 1e-6
+
+
+def sample(name, n):
+    """
+    Expected output with about n values for a comparator.
+    """
+    if name == 'float':
+        return ''.join('%.9f\n' % random.random() for i in xrange(n))
+    if name == 'grid':
+        width = int(n ** 0.5) or 1
+        rows = []
+        for i in xrange(n / width):
+            indent = ' ' if i % 2 else ''
+            rows.append(indent + ' '.join(random.choice('.#') for j in xrange(width)) + '\n')
+        return ''.join(rows)
+    return ''.join('%d %d\n' % (i, random.randint(0, 10 ** 6)) for i in xrange(n))
+
+
+class Command(NoArgsCommand):
+    help = 'Measure the throughput of each output comparator.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--values', type='int', default=1000000,
+            help='Number of values per output.'),
+    )
+
+    def handle_noargs(self, **options):
+        for name, label in comparators.COMPARATOR_CHOICES:
+            expected = sample(name, options['values'])
+            output = expected
+            if name == 'unordered':
+                lines = expected.splitlines(True)
+                random.shuffle(lines)
+                output = ''.join(lines)
+
+            comparator = comparators.COMPARATORS[name](Challenge())
+            start = time.time()
+            error = comparator.compare(StringIO(output), StringIO(expected))
+            elapsed = time.time() - start
+
+            if error:
+                raise CommandError('%s: %s' % (name, error))
+            self.stdout.write('%-10s %8.2fs  %7.1f MB/s' % (
+                name, elapsed, len(expected) / elapsed / 1024 ** 2))
@@ -0,0 +1,228 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+from multiprocessing.pool import ThreadPool
+from optparse import make_option
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management.base import NoArgsCommand, CommandError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from pq.models import Challenge, Set, Solution
+from pq import samplescripts
+
+VIEWS = ['challenge', 'solution_begin', 'solution_upload', 'challenge_state']
+
+
+def percentile(values, p):
+    # nearest rank
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, int(round(p / 100.0 * len(values))) - 1)]
+
+
+class Recorder(object):
+    """
+    Latencies and query counts per view, collected from every thread.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = dict((view, []) for view in VIEWS)
+        self.errors = dict((view, 0) for view in VIEWS)
+
+    def request(self, view, method, *args, **kwargs):
+        # anything but the expected status counts as an error
+        expect = kwargs.pop('expect', 200)
+        start = time.time()
+        response = method(*args, **kwargs)
+        if getattr(response, 'streaming', False):
+            response.content_bytes = ''.join(response.streaming_content)
+        else:
+            response.content_bytes = response.content
+        elapsed = time.time() - start
+        with self.lock:
+            # the query log is reset when each request starts
+            self.samples[view].append((elapsed, len(connection.queries)))
+            if response.status_code != expect:
+                self.errors[view] += 1
+        return response
+
+    def error(self, view):
+        with self.lock:
+            self.errors[view] += 1
+
+    def summary(self):
+        views = {}
+        for view in VIEWS:
+            times = [t for t, q in self.samples[view]]
+            queries = [q for t, q in self.samples[view]]
+            if not times:
+                continue
+            views[view] = {
+                'requests': len(times),
+                'errors': self.errors[view],
+                'mean': sum(times) / len(times),
+                'p50': percentile(times, 50),
+                'p95': percentile(times, 95),
+                'p99': percentile(times, 99),
+                'queries_mean': float(sum(queries)) / len(queries),
+                'queries_max': max(queries),
+            }
+        return views
+
+
+class Command(NoArgsCommand):
+    help = ('Simulate contestants working through a challenge against a throwaway database, '
+        'and report latency, throughput and queries per view.')
+    option_list = NoArgsCommand.option_list + (
+        make_option('--users', type='int', default=50,
+            help='Number of simulated contestants.'),
+        make_option('--sets', type='int', default=2,
+            help='Number of sets in the challenge.'),
+        make_option('--concurrency', type='int', default=8,
+            help='Number of contestants active at once.'),
+        make_option('--refreshes', type='int', default=2,
+            help='State refreshes per set, as the challenge page polls.'),
+        make_option('--output', default=None,
+            help='Write the results as JSON to this file.'),
+        make_option('--baseline', default=None,
+            help='Compare with the JSON results of an earlier run.'),
+    )
+
+    def handle_noargs(self, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                with open(options['baseline']) as f:
+                    baseline = json.load(f)
+            except (IOError, ValueError) as e:
+                raise CommandError('Could not read %s: %s' % (options['baseline'], e))
+
+        tmp = tempfile.mkdtemp()
+        db = settings.DATABASES['default']
+        old_test_name = db.get('TEST_NAME')
+        if db['ENGINE'].endswith('sqlite3'):
+            # threads can't share an in-memory database
+            db['TEST_NAME'] = os.path.join(tmp, 'bench.sqlite')
+        overrides = override_settings(MEDIA_ROOT=os.path.join(tmp, 'media'),
+            PQ_BLOB_ROOT=os.path.join(tmp, 'blobs'),
+            PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+
+        setup_test_environment()
+        overrides.enable()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            cache.clear()
+            challenge, sets, users = self.seed(options['users'], options['sets'])
+            results = self.run(challenge, sets, users, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            overrides.disable()
+            teardown_test_environment()
+            db['TEST_NAME'] = old_test_name
+            shutil.rmtree(tmp)
+
+        self.report(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+
+    def seed(self, n_users, n_sets):
+        password = make_password('bench')
+        User.objects.bulk_create([User(username='bench%d' % i, password=password)
+            for i in range(n_users + 1)])
+        users = list(User.objects.order_by('id'))
+        sets = [Set.objects.create(title='Set %d' % i, points=10 * (i + 1), time_limit=600)
+            for i in range(n_sets)]
+        challenge = Challenge(title='Benchmark', author=users[0], status=2, started=datetime.now(),
+            use_input_validation=True, source_req=False, preamble='Benchmark', body='Benchmark')
+        challenge.generator.save('gen.py', ContentFile(samplescripts.generator(100)), save=False)
+        challenge.validator.save('val.py', ContentFile(samplescripts.VALIDATOR), save=False)
+        challenge.save()
+        challenge.sets.add(*sets)
+        return challenge, sets, users[1:]
+
+    def contestant(self, recorder, challenge, sets, user, refreshes):
+        connection.use_debug_cursor = True
+        try:
+            client = Client()
+            client.login(username=user.username, password='bench')
+            page = '/challenge/%d/' % challenge.id
+            state = '/challenge/%d/state/' % challenge.id
+            for set in sets:
+                recorder.request('challenge', client.get, page)
+                response = recorder.request('solution_begin', client.get,
+                    '/challenge/%d/begin/%d/' % (challenge.id, set.id))
+                if response.status_code != 200:
+                    # counted as an error, there is no input to work on
+                    continue
+                output = ''.join('%d\n' % (int(line) * 2) for line in response.content_bytes.splitlines())
+                solution = Solution.objects.get(challenge=challenge, author=user, set=set)
+                for i in range(refreshes):
+                    recorder.request('challenge_state', client.get, state)
+                response = recorder.request('solution_upload', client.post,
+                    '/challenge/%d/%d/upload/' % (challenge.id, solution.id),
+                    {'output_user': SimpleUploadedFile('out.txt', output, 'text/plain'), 'solution': solution.id},
+                    expect=302)
+                # a rejected output redirects too
+                if response.status_code == 302 and not Solution.objects.filter(id=solution.id, status=2).exists():
+                    recorder.error('solution_upload')
+        finally:
+            connection.close()
+
+    def run(self, challenge, sets, users, options):
+        recorder = Recorder()
+        pool = ThreadPool(options['concurrency'])
+        start = time.time()
+        pending = [pool.apply_async(self.contestant, (recorder, challenge, sets, user, options['refreshes']))
+            for user in users]
+        for result in pending:
+            # re-raises anything a contestant thread ran into
+            result.get()
+        elapsed = time.time() - start
+        pool.close()
+        pool.join()
+
+        views = recorder.summary()
+        requests = sum(v['requests'] for v in views.values())
+        completed = Solution.objects.filter(challenge=challenge, status=2).count()
+        return {
+            'date': datetime.now().isoformat(),
+            'options': dict((k, options[k]) for k in ('users', 'sets', 'concurrency', 'refreshes')),
+            'database': settings.DATABASES['default']['ENGINE'],
+            'elapsed': elapsed,
+            'requests': requests,
+            'throughput': requests / elapsed,
+            'completed': completed,
+            'views': views,
+        }
+
+    def report(self, results, baseline=None):
+        self.stdout.write('%-16s %8s %6s %8s %8s %8s %8s %8s' % (
+            'view', 'requests', 'errors', 'p50 ms', 'p95 ms', 'p99 ms', 'queries', 'max q'))
+        for view in VIEWS:
+            v = results['views'].get(view)
+            if not v:
+                continue
+            line = '%-16s %8d %6d %8.1f %8.1f %8.1f %8.1f %8d' % (view, v['requests'], v['errors'],
+                v['p50'] * 1000, v['p95'] * 1000, v['p99'] * 1000, v['queries_mean'], v['queries_max'])
+            old = baseline and baseline['views'].get(view)
+            if old:
+                line += '  p95 %+.0f%%' % (100 * (v['p95'] / old['p95'] - 1))
+            self.stdout.write(line)
+        self.stdout.write('%d requests in %.1fs, %.1f requests/s, %d of %d solutions completed.' % (
+            results['requests'], results['elapsed'], results['throughput'], results['completed'],
+            results['options']['users'] * results['options']['sets']))
+        if baseline:
+            self.stdout.write('Baseline throughput %.1f requests/s (%+.0f%%).' % (baseline['throughput'],
+                100 * (results['throughput'] / baseline['throughput'] - 1)))
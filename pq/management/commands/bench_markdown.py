@@ -0,0 +1,48 @@
+import time
+from optparse import make_option
+from django.core.management.base import NoArgsCommand, CommandError
+from django.template import Context, Template
+from pq.models import Challenge
+
+BEFORE = Template('{% load markup %}{{ c.preamble|markdown }}{{ c.body|markdown }}')
+AFTER = Template('{{ c.preamble_html|safe }}{{ c.body_html|safe }}')
+
+SAMPLE = """
+Some *sample* challenge text with a [link](http://proggitquiz.com) and `code`.
+
+1. First rule
+2. Second rule
+
+    for line in sys.stdin:
+        print line
+
+> A quote, to make the parser work for it.
+"""
+
+
+class Command(NoArgsCommand):
+    help = 'Compare rendering challenge markdown per view with serving the pre-rendered HTML.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--challenge', type='int', default=None,
+            help='Render this challenge instead of sample text.'),
+        make_option('--renders', type='int', default=1000,
+            help='Number of renders per mode.'),
+    )
+
+    def handle_noargs(self, **options):
+        if options['challenge']:
+            try:
+                challenge = Challenge.objects.get(id=options['challenge'])
+            except Challenge.DoesNotExist:
+                raise CommandError('Challenge %d does not exist.' % options['challenge'])
+        else:
+            challenge = Challenge(preamble=SAMPLE, body=SAMPLE * 10)
+            challenge.render_markdown()
+
+        context = Context({'c': challenge})
+        for name, template in [('markdown', BEFORE), ('pre-rendered', AFTER)]:
+            start = time.time()
+            for i in range(options['renders']):
+                template.render(context)
+            elapsed = time.time() - start
+            self.stdout.write('%-14s %8.3f ms/render' % (name, 1000 * elapsed / options['renders']))
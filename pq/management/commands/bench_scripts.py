@@ -0,0 +1,52 @@
+import os
+import shutil
+import tempfile
+import time
+from optparse import make_option
+from django.core.management.base import NoArgsCommand, CommandError
+from pq.models import Challenge, spawn_script
+from pq.workers import WorkerPool
+from pq import samplescripts
+
+
+class Command(NoArgsCommand):
+    help = 'Compare script calls per second for fresh interpreters and persistent workers.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--calls', type='int', default=50,
+            help='Number of generate/validate calls per mode.'),
+        make_option('--challenge', type='int', default=None,
+            help='Benchmark the scripts of this challenge instead of built-in trivial ones.'),
+        make_option('--set', type='int', default=1,
+            help='Set id passed to the generator.'),
+    )
+
+    def handle_noargs(self, **options):
+        tmp = None
+        if options['challenge']:
+            try:
+                challenge = Challenge.objects.get(id=options['challenge'])
+            except Challenge.DoesNotExist:
+                raise CommandError('Challenge %d does not exist.' % options['challenge'])
+            generator, validator = challenge.generator.path, challenge.validator.path
+        else:
+            tmp = tempfile.mkdtemp()
+            generator = os.path.join(tmp, 'gen.py')
+            validator = os.path.join(tmp, 'val.py')
+            open(generator, 'w').write(samplescripts.generator(10))
+            open(validator, 'w').write(samplescripts.VALIDATOR)
+
+        workers = WorkerPool()
+        modes = [('subprocess', spawn_script), ('worker', workers.run)]
+        try:
+            for name, run in modes:
+                start = time.time()
+                for i in range(options['calls']):
+                    input_gen = run(generator, ['%d' % options['set']])
+                    run(validator, [], input_gen)
+                elapsed = time.time() - start
+                self.stdout.write('%-12s %8.1f calls/s  (%d calls in %.2fs)' % (
+                    name, 2 * options['calls'] / elapsed, 2 * options['calls'], elapsed))
+        finally:
+            workers.shutdown()
+            if tmp:
+                shutil.rmtree(tmp)
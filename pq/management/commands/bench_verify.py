@@ -0,0 +1,72 @@
+import os
+import resource
+import shutil
+import tempfile
+import time
+from optparse import make_option
+from django.core.management.base import NoArgsCommand, CommandError
+from django.test.utils import override_settings
+from pq import blobstore, verify
+
+UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_size(size):
+    size = size.strip().upper()
+    if size[-1] in UNITS:
+        return int(size[:-1]) * UNITS[size[-1]]
+    return int(size)
+
+
+def iter_output(size):
+    """
+    Yield chunks of numbered lines adding up to roughly size bytes.
+    """
+    i, written = 0, 0
+    while written < size:
+        chunk = ''.join('%d %d\n' % (n, n * 2) for n in xrange(i, i + 4096))
+        i += 4096
+        written += len(chunk)
+        yield chunk
+
+
+class Command(NoArgsCommand):
+    help = 'Measure output verification speed and memory for large outputs.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--sizes', default='1M,100M,1G',
+            help='Comma separated output sizes to verify.'),
+    )
+
+    def handle_noargs(self, **options):
+        try:
+            sizes = [parse_size(s) for s in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('Invalid sizes: %s' % options['sizes'])
+
+        tmp = tempfile.mkdtemp()
+        try:
+            with override_settings(PQ_BLOB_ROOT=os.path.join(tmp, 'blobs')):
+                for size in sizes:
+                    self.bench(tmp, size)
+        finally:
+            shutil.rmtree(tmp)
+
+    def bench(self, tmp, size):
+        digest, size = blobstore.put_chunks(iter_output(size))
+        path = os.path.join(tmp, 'output')
+        with open(path, 'wb') as f:
+            for chunk in iter_output(size):
+                f.write(chunk)
+
+        start = time.time()
+        with open(path, 'rb') as output:
+            with blobstore.open(digest) as expected:
+                line = verify.verify(output, expected)
+        elapsed = time.time() - start
+
+        if line:
+            raise CommandError('Verification failed on line %d.' % line)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+        self.stdout.write('%10d bytes  %7.2fs  %7.1f MB/s  peak rss %.1f MB' % (
+            size, elapsed, size / elapsed / UNITS['M'], peak))
+        os.remove(path)
@@ -0,0 +1,35 @@
+import sys
+from optparse import make_option
+from django.core.management.base import BaseCommand, CommandError
+from pq.models import Challenge
+from pq import export
+
+
+class Command(BaseCommand):
+    args = '<challenge id> [<challenge id> ...]'
+    help = 'Write the sources, outputs and scoreboards of challenges to a tar.gz.'
+    option_list = BaseCommand.option_list + (
+        make_option('--output', default=None,
+            help='File to write, - for stdout. Defaults to pq-<ids>.tar.gz.'),
+    )
+
+    def handle(self, *args, **options):
+        if not args:
+            raise CommandError('Give the ids of the challenges to export.')
+        challenges = []
+        for id in args:
+            try:
+                challenges.append(Challenge.objects.get(id=int(id)))
+            except (ValueError, Challenge.DoesNotExist):
+                raise CommandError('No challenge with id %s.' % id)
+
+        output = options['output'] or export.archive_filename(challenges)
+        f = sys.stdout if output == '-' else open(output, 'wb')
+        try:
+            for chunk in export.iter_archive(challenges):
+                f.write(chunk)
+        finally:
+            if f is not sys.stdout:
+                f.close()
+        if output != '-':
+            self.stdout.write('Wrote %s.' % output)
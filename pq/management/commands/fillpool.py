@@ -0,0 +1,25 @@
+import time
+from optparse import make_option
+from django.core.management.base import NoArgsCommand
+from pq import pool
+
+
+class Command(NoArgsCommand):
+    help = 'Top up the pre-generated input pools of all challenges in progress.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--depth', type='int', default=pool.POOL_DEPTH,
+            help='Number of pairs to keep ready per set.'),
+        make_option('--loop', action='store_true', default=False,
+            help='Keep refilling until interrupted.'),
+        make_option('--interval', type='float', default=1.0,
+            help='Seconds to sleep between refills when looping.'),
+    )
+
+    def handle_noargs(self, **options):
+        while True:
+            n = pool.fill_all(options['depth'])
+            if n or not options['loop']:
+                self.stdout.write('Generated %d inputs.' % n)
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,23 @@
+import time
+from optparse import make_option
+from django.core.management.base import NoArgsCommand
+from pq import jobs
+
+
+class Command(NoArgsCommand):
+    help = 'Run queued input generation jobs.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--loop', action='store_true', default=False,
+            help='Keep polling the queue until interrupted.'),
+        make_option('--interval', type='float', default=0.5,
+            help='Seconds to sleep when the queue is empty.'),
+    )
+
+    def handle_noargs(self, **options):
+        while True:
+            n = jobs.run_pending()
+            if n or not options['loop']:
+                self.stdout.write('Ran %d jobs.' % n)
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
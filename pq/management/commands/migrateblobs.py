@@ -0,0 +1,75 @@
+from django.core.management.base import NoArgsCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from pq import blobstore, verify
+from pq.models import Solution, PooledInput
+
+BATCH_SIZE = 100
+
+
+class Command(NoArgsCommand):
+    help = ('Move generated inputs and outputs out of the solution table into the blob store, '
+            'rebuilding the table without the old text columns.')
+
+    def handle_noargs(self, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Only sqlite databases can be migrated.')
+
+        cursor = connection.cursor()
+        table = Solution._meta.db_table
+        old_columns = [c[0] for c in connection.introspection.get_table_description(cursor, table)]
+        if 'input_gen' not in old_columns:
+            self.stdout.write('Nothing to migrate.')
+            return
+
+        with transaction.commit_on_success():
+            n = self.migrate_solutions(cursor, table, old_columns)
+            self.recreate(cursor, PooledInput)
+        self.stdout.write('Migrated %d solutions.' % n)
+
+    def migrate_solutions(self, cursor, table, old_columns):
+        qn = connection.ops.quote_name
+        new_table = table + '_new'
+
+        # the table is rebuilt under a new name, copied, and renamed back,
+        # which is how sqlite wants columns to be dropped
+        for sql in self.create_sql(Solution):
+            cursor.execute(sql.replace(qn(table), qn(new_table), 1))
+        columns = ', '.join(qn(f.column) for f in Solution._meta.local_fields if f.column in old_columns)
+        cursor.execute('INSERT INTO %s (%s) SELECT %s FROM %s' % (qn(new_table), columns, columns, qn(table)))
+
+        n = 0
+        read = connection.cursor()
+        read.execute('SELECT id, input_gen, output_gen FROM %s' % qn(table))
+        rows = read.fetchmany(BATCH_SIZE)
+        while rows:
+            for id, input_gen, output_gen in rows:
+                input_gen = (input_gen or '').encode('utf-8')
+                output_gen = (output_gen or '').encode('utf-8')
+                input_digest, input_size = blobstore.put(input_gen)
+                output_digest, output_size = blobstore.put(output_gen)
+                output_check = verify.line_digest([output_gen])
+                cursor.execute('UPDATE %s SET input_digest = %%s, input_size = %%s, output_digest = %%s, '
+                               'output_size = %%s, output_check = %%s WHERE id = %%s' % qn(new_table),
+                               [input_digest, input_size, output_digest, output_size, output_check, id])
+                n += 1
+            rows = read.fetchmany(BATCH_SIZE)
+
+        cursor.execute('DROP TABLE %s' % qn(table))
+        cursor.execute('ALTER TABLE %s RENAME TO %s' % (qn(new_table), qn(table)))
+        for sql in connection.creation.sql_indexes_for_model(Solution, no_style()):
+            cursor.execute(sql)
+        return n
+
+    def recreate(self, cursor, model):
+        # pooled inputs are disposable, the pool is simply refilled
+        if model._meta.db_table in connection.introspection.table_names():
+            cursor.execute('DROP TABLE %s' % connection.ops.quote_name(model._meta.db_table))
+        for sql in self.create_sql(model):
+            cursor.execute(sql)
+        for sql in connection.creation.sql_indexes_for_model(model, no_style()):
+            cursor.execute(sql)
+
+    def create_sql(self, model):
+        sql, references = connection.creation.sql_create_model(model, no_style(), set())
+        return sql
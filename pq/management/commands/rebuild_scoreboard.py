@@ -0,0 +1,28 @@
+from optparse import make_option
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+from pq.models import Challenge
+from pq import caching, scoreboard
+
+
+class Command(NoArgsCommand):
+    help = 'Rebuild the materialized scoreboards and the leaderboard from the solutions.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--challenge', type='int', default=None,
+            help='Only rebuild the scoreboard of this challenge.'),
+    )
+
+    def handle_noargs(self, **options):
+        challenges = Challenge.objects.all()
+        if options['challenge']:
+            challenges = challenges.filter(id=options['challenge'])
+
+        for challenge in challenges:
+            with transaction.commit_on_success():
+                n = scoreboard.rebuild(challenge)
+            self.stdout.write('%s: %d users.' % (challenge, n))
+
+        with transaction.commit_on_success():
+            n = scoreboard.rebuild_rankings()
+        caching.invalidate_scores()
+        self.stdout.write('Leaderboard: %d users.' % n)
@@ -0,0 +1,25 @@
+import time
+from optparse import make_option
+from django.core.management.base import NoArgsCommand, CommandError
+from pq import database
+
+
+class Command(NoArgsCommand):
+    help = 'Copy the database over the read replica the scoreboards are read from.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--loop', action='store_true', default=False,
+            help='Keep refreshing until interrupted.'),
+        make_option('--interval', type='float', default=10.0,
+            help='Seconds to sleep between refreshes when looping.'),
+    )
+
+    def handle_noargs(self, **options):
+        if not database.has_replica():
+            raise CommandError("There is no 'replica' database in DATABASES.")
+        while True:
+            start = time.time()
+            database.refresh_replica()
+            if not options['loop']:
+                self.stdout.write('Refreshed the replica in %.2fs.' % (time.time() - start))
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,13 @@
+from django.core.management.base import NoArgsCommand
+from pq.models import Challenge
+
+
+class Command(NoArgsCommand):
+    help = 'Render the markdown of every challenge, for challenges saved before it was pre-rendered.'
+
+    def handle_noargs(self, **options):
+        n = 0
+        for challenge in Challenge.objects.all():
+            challenge.save()
+            n += 1
+        self.stdout.write('Rendered %d challenges.' % n)
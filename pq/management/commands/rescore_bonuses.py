@@ -0,0 +1,28 @@
+from optparse import make_option
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+from pq.models import Challenge
+from pq import bonuses, caching, scoreboard
+
+
+class Command(NoArgsCommand):
+    help = 'Re-evaluate the bonus rules for every completed solution, then rebuild the scoreboards.'
+    option_list = NoArgsCommand.option_list + (
+        make_option('--challenge', type='int', default=None,
+            help='Only rescore this challenge.'),
+    )
+
+    def handle_noargs(self, **options):
+        challenges = Challenge.objects.all()
+        if options['challenge']:
+            challenges = challenges.filter(id=options['challenge'])
+
+        for challenge in challenges:
+            with transaction.commit_on_success():
+                n = bonuses.rescore(challenge)
+                scoreboard.rebuild(challenge)
+            self.stdout.write('%s: %d bonuses.' % (challenge, n))
+
+        with transaction.commit_on_success():
+            scoreboard.rebuild_rankings()
+        caching.invalidate_scores()
@@ -1,11 +1,19 @@
 import os
 import re
+import json
+import hashlib
+import markdown
+from contextlib import closing
 from datetime import datetime, timedelta
-from subprocess import check_output, Popen, PIPE
+from StringIO import StringIO
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from django.utils import timezone
-from django.db.models import Sum, Max
+from django.utils.encoding import force_text
+from django.db.models import Sum, Max, F
+from pq import blobstore, comparators, highlight, profiling, sandbox, seeds, serving, verify, workers
 
 PRB_STATUS_CHOICES = (
     (0, 'Removed'),
@@ -25,8 +33,49 @@ SOL_STATUS_CHOICES = (
     (2, 'Complete'),
 )
 
+JOB_STATUS_CHOICES = (
+    (0, 'Queued'),
+    (1, 'Running'),
+    (2, 'Done'),
+    (3, 'Failed'),
+)
+
+BONUS_RULE_CHOICES = (
+    ('manual', 'Awarded by hand'),
+    ('deadline', 'Submitted within "seconds" of generation'),
+    ('earlybird', 'Submitted within "hours" of the challenge start'),
+    ('first', 'First completed solution of the set'),
+)
+
+BONUS_RULE_PARAMS = {
+    'deadline': ['seconds'],
+    'earlybird': ['hours'],
+}
+
 GRACE_PERIOD = 5 # seconds
 
+# run generator/validator scripts in persistent worker processes
+SCRIPT_WORKERS = getattr(settings, 'PQ_SCRIPT_WORKERS', False)
+
+def run_script(path, args=(), input=''):
+    """
+    Run a challenge script in the sandbox and return its output. The run is
+    counted in the script's ScriptStats.
+    """
+    if SCRIPT_WORKERS:
+        result = workers.pool.execute(path, args, input)
+    else:
+        result = sandbox.execute(path, args, input)
+    ScriptStats.record(result)
+    profiling.add('script', result.elapsed)
+    return result.check()
+
+def spawn_script(path, args=(), input=''):
+    """
+    Run a challenge script in a fresh interpreter.
+    """
+    return sandbox.execute(path, args, input).check()
+
 def get_fn_generator(instance, filename):    
     slug = re.sub(r'[\W_]+', '', instance.title.lower())[:50]
     return 'generators/%s-gen.py' % slug
@@ -64,11 +113,17 @@ class Challenge(models.Model):
     type = models.IntegerField(choices=CHALLENGE_TYPE_CHOICES, default=0)
     source_req = models.BooleanField('Source code required?')
     use_input_validation = models.BooleanField('Input validates output?')
+    comparator = models.CharField(max_length=20, choices=comparators.COMPARATOR_CHOICES, default='exact')
+    tolerance = models.FloatField(default=1e-6, help_text='Tolerance for numeric comparison.')
+    seeded_generator = models.BooleanField('Generator takes a seed?', default=False,
+        help_text='The seed is the second argument, and the same set and seed always give the same input.')
     # spoilers = models.BooleanField()    
 
-    # descriptions
+    # descriptions, and their markdown rendered on save
     preamble = models.TextField()
     body = models.TextField()
+    preamble_html = models.TextField(blank=True, editable=False)
+    body_html = models.TextField(blank=True, editable=False)
 
     # scripts
     generator = models.FileField(null=True, upload_to=get_fn_generator)
@@ -76,7 +131,7 @@ class Challenge(models.Model):
     
     # dates
     created = models.DateField(auto_now_add=True)
-    started = models.DateTimeField(null=True, blank=True)
+    started = models.DateTimeField(null=True, blank=True, db_index=True)
     completed = models.DateTimeField(null=True, blank=True)
 
     # sets and bonuses
@@ -86,6 +141,34 @@ class Challenge(models.Model):
     def __unicode__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.render_markdown()
+        super(Challenge, self).save(*args, **kwargs)
+
+    def render_markdown(self):
+        # rendered once here instead of on every view of the challenge
+        self.preamble_html = markdown.markdown(force_text(self.preamble))
+        self.body_html = markdown.markdown(force_text(self.body))
+
+    def generate(self, set, seed=None):
+        """
+        Run the generator and validator scripts for a set. Returns a tuple of
+        (input, expected output).
+        """
+        args = ['%d' % set.id]
+        if seed is not None:
+            args.append('%d' % seed)
+        input_gen = run_script(self.generator.path, args)
+
+        # the validator either reads the generated input, or just the set id
+        if self.use_input_validation:
+            validator_input = input_gen
+        else:
+            validator_input = str(set.id)
+
+        output_gen = run_script(self.validator.path, input=validator_input)
+        return input_gen, output_gen
+
 
 class Set(models.Model):
     """
@@ -104,7 +187,94 @@ class Set(models.Model):
         second = int(self.time_limit % 60)
         return "%d:%02d" % (minute, second)        
 
-class Solution(models.Model):
+class GeneratedData(models.Model):
+    """
+    Generated input and expected output, kept in the blob store. The row only
+    holds their digests and sizes, the content is read lazily. Data with a
+    seed is not stored at all, but regenerated from the seed.
+    """
+
+    input_digest = models.CharField(max_length=40, blank=True)
+    input_size = models.IntegerField(default=0)
+    output_digest = models.CharField(max_length=40, blank=True)
+    output_size = models.IntegerField(default=0)
+    output_check = models.CharField('Normalized output digest', max_length=40, blank=True)
+    seed = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def _get_blob(self, field):
+        if self.seed is not None:
+            return self.regenerate()[field == 'output']
+        digest = getattr(self, '%s_digest' % field)
+        if not digest:
+            return ''
+        return blobstore.read(digest)
+
+    def _set_blob(self, field, data):
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+        self.seed = None
+        digest, size = blobstore.put(data)
+        setattr(self, '%s_digest' % field, digest)
+        setattr(self, '%s_size' % field, size)
+        if field == 'output':
+            self.output_check = verify.line_digest([data])
+
+    input_gen = property(lambda self: self._get_blob('input'),
+                         lambda self, data: self._set_blob('input', data))
+    output_gen = property(lambda self: self._get_blob('output'),
+                          lambda self, data: self._set_blob('output', data))
+
+    def copy_generated(self, other):
+        """
+        Take over the input and expected output of another instance.
+        """
+        self.input_digest, self.input_size = other.input_digest, other.input_size
+        self.output_digest, self.output_size = other.output_digest, other.output_size
+        self.output_check = other.output_check
+        self.seed = other.seed
+
+    def seed_generated(self, seed):
+        """
+        Switch to data generated from a seed. The scripts run right away, to
+        record the digests and warm the seed cache for the download.
+        """
+        self.seed = seed
+        self.input_digest = self.output_digest = self.output_check = ''
+        self.input_size = self.output_size = 0
+        return self.regenerate()
+
+    def regenerate(self):
+        """
+        Input and expected output of seeded data, from the seed cache or by
+        running the scripts again.
+        """
+        input_gen, output_gen = seeds.generate(self.challenge, self.set, self.seed, self.input_digest)
+        if not self.input_digest:
+            self.input_digest, self.input_size = hashlib.sha1(input_gen).hexdigest(), len(input_gen)
+            self.output_digest, self.output_size = hashlib.sha1(output_gen).hexdigest(), len(output_gen)
+            self.output_check = verify.line_digest([output_gen])
+        return input_gen, output_gen
+
+    def iter_input(self):
+        if self.seed is not None:
+            return [self.input_gen]
+        return blobstore.iter_chunks(self.input_digest)
+
+    def open_input(self):
+        if self.seed is not None:
+            return closing(StringIO(self.input_gen))
+        return blobstore.open(self.input_digest)
+
+    def open_output(self):
+        if self.seed is not None:
+            return closing(StringIO(self.output_gen))
+        return blobstore.open(self.output_digest)
+
+
+class Solution(GeneratedData):
     """
     A solution is a user attempt to solve a set.
     """
@@ -117,32 +287,55 @@ class Solution(models.Model):
     attempt = models.IntegerField(default=0)
     generated = models.DateTimeField(blank=True, null=True)
     submitted = models.DateTimeField(blank=True, null=True)
-    input_gen = models.TextField(blank=True)
-    output_gen = models.TextField(blank=True)
     output_user = models.FileField('Completed output file', blank=True, null=True, upload_to=get_fn_output)
     source = models.FileField('Source code', blank=True, null=True, upload_to=get_fn_source)
+    source_digest = models.CharField(max_length=40, blank=True, editable=False)
     language = models.ForeignKey('Language', blank=True, null=True)
     bonuses = models.ManyToManyField('Bonus', blank=True)
 
     class Meta:
+        # (challenge, author) lookups use the unique index; the others are
+        # for completed solutions per challenge and set, and the first of them
         unique_together = ['challenge', 'author', 'set']
-
-    def generate(self):
-        # generate input/output on creation
+        index_together = [
+            ['challenge', 'status', 'set', 'submitted'],
+            ['challenge', 'set', 'status'],
+        ]
+
+    def save(self, *args, **kwargs):
+        # new sources are hashed for their ETag, and get a compressed copy and
+        # highlighted HTML
+        new_source = bool(self.source) and not self.source._committed
+        if new_source:
+            self.source_digest = serving.file_digest(self.source.file)
+        elif not self.source:
+            self.source_digest = ''
+        super(Solution, self).save(*args, **kwargs)
+        if new_source:
+            serving.write_gzip(self.source.path)
+            highlight.solution_html(self)
+
+    def update_source_digest(self):
+        """
+        Hash and compress a source stored before sources were hashed.
+        """
+        with open(self.source.path, 'rb') as f:
+            self.source_digest = serving.file_digest(f)
+        serving.write_gzip(self.source.path)
+        Solution.objects.filter(id=self.id).update(source_digest=self.source_digest)
+
+    def generate(self, pooled=None):
+        # generate input/output on creation, unless a pre-generated pair is given
         self.attempt += 1
         self.generated = datetime.now()
 
-        # run generator script
-        output = check_output(['python', self.challenge.generator.path, '%d' % self.set.id])
-        if self.challenge.use_input_validation:
-            self.input_gen = output
+        if pooled:
+            self.copy_generated(pooled)
+        elif self.challenge.seeded_generator:
+            self.seed_generated(seeds.make_seed(self))
         else:
-            self.input_gen = str(self.set.id)
-
-        # run validator script
-        p = Popen(['python', self.challenge.validator.path], stdin=PIPE, stdout=PIPE)
-        self.output_gen = p.communicate(self.input_gen)[0]
-        return output
+            self.input_gen, self.output_gen = self.challenge.generate(self.set)
+        return self.input_gen
 
     def is_expired(self):
         if self.set.time_limit <= 0:
@@ -152,39 +345,34 @@ class Solution(models.Model):
         else:
             return timezone.now() > self.generated + timedelta(seconds=self.set.time_limit+GRACE_PERIOD)
 
+    def get_input_filename(self):
+        return 'pq-p%d-%s-%d.in' % (self.challenge.id, self.set.title.lower(), self.attempt)
+
     def get_time_left(self):
         s = self.set.time_limit + GRACE_PERIOD - (timezone.now() - self.generated).total_seconds()
         minute = int(s / 60)
         second = int(s % 60)
         return '%d:%02d' % (minute, second)
 
-    def apply_bonuses(self):
-        bonuses = self.challenge.bonuses.all()
-        b_ids = [b.id for b in bonuses]
-        if 1 in b_ids and self.has_runtime_bonus():
-            self.bonuses.add(Bonus.objects.get(id=1))
-        if 2 in b_ids and self.has_earlybird_bonus():
-            self.bonuses.add(Bonus.objects.get(id=2))
-        if 3 in b_ids and self.has_first_post_bonus():
-            self.bonuses.add(Bonus.objects.get(id=3))
-
-    def has_earlybird_bonus(self):        
-        return self.set.id == 2 and self.submitted and self.submitted < self.challenge.started + timedelta(hours=24)
-
-    def has_runtime_bonus(self):
-        return self.set.id == 2 and self.submitted and self.submitted < self.generated + timedelta(seconds=65)
-
-    def has_first_post_bonus(self):
-        n_solutions = self.challenge.solution_set.filter(set_id=5).count()
-        return self.set.id == 5 and n_solutions == 1
-        
 class Bonus(models.Model):
     title = models.CharField(max_length=100)
     description = models.TextField()
     icon = models.CharField(max_length=100)
     points = models.IntegerField(default=0)
+    rule = models.CharField(max_length=20, choices=BONUS_RULE_CHOICES, default='manual')
+    params = models.TextField(blank=True, help_text='JSON, e.g. {"set": 2, "seconds": 65}')
     def __unicode__(self):
         return self.title
+    def clean(self):
+        try:
+            params = json.loads(self.params) if self.params else {}
+        except ValueError:
+            raise ValidationError('Parameters must be valid JSON.')
+        if not isinstance(params, dict):
+            raise ValidationError('Parameters must be a JSON object.')
+        for name in BONUS_RULE_PARAMS.get(self.rule, ()):
+            if name not in params:
+                raise ValidationError('This rule needs the parameter "%s".' % name)
     class Meta:
         verbose_name_plural = 'bonuses'
 
@@ -194,4 +382,180 @@ class Language(models.Model):
     def __unicode__(self):
         return self.name
     class Meta:
-        ordering = ['name']        
\ No newline at end of file
+        ordering = ['name']
+
+class Score(models.Model):
+    """
+    Scoreboard row of a user in a challenge, kept up to date by pq.scoreboard
+    so the scoreboard can be read in a single query.
+    """
+
+    challenge = models.ForeignKey('Challenge')
+    user = models.ForeignKey(User)
+    points = models.IntegerField(default=0)
+    bonus_points = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    # completed solutions as space separated "id:set" pairs, see solution_links
+    solutions = models.CharField(max_length=255, blank=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['challenge', 'user']
+        index_together = [['challenge', 'total']]
+
+    def __unicode__(self):
+        return '%s: %s (%d)' % (self.challenge, self.user, self.total)
+
+    def solution_links(self):
+        links = []
+        for pair in self.solutions.split():
+            id, label = pair.split(':', 1)
+            links.append({'id': int(id), 'label': label})
+        return links
+
+class Ranking(models.Model):
+    """
+    A user's total over all challenges, for the global leaderboard. Ranks are
+    counted from the index on total, see pq.scoreboard.get_rank.
+    """
+
+    user = models.OneToOneField(User)
+    total = models.IntegerField(default=0, db_index=True)
+    challenges = models.IntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __unicode__(self):
+        return '%s (%d)' % (self.user, self.total)
+
+class PooledInput(GeneratedData):
+    """
+    A pre-generated input/output pair waiting to be handed out for a set.
+    """
+
+    challenge = models.ForeignKey('Challenge')
+    set = models.ForeignKey(Set)
+    created = models.DateTimeField(auto_now_add=True)
+    claimed = models.BooleanField(default=False)
+
+    def __unicode__(self):
+        return '%s / %s #%d' % (self.challenge, self.set.title, self.id)
+
+class PoolStats(models.Model):
+    """
+    Pool hit/miss counters for a challenge set.
+    """
+
+    challenge = models.ForeignKey('Challenge')
+    set = models.ForeignKey(Set)
+    hits = models.IntegerField(default=0)
+    misses = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['challenge', 'set']
+        verbose_name_plural = 'pool stats'
+
+    def depth(self):
+        return PooledInput.objects.filter(challenge=self.challenge, set=self.set, claimed=False).count()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        if not total:
+            return '-'
+        return '%d%%' % (100 * self.hits / total)
+
+class ScriptStats(models.Model):
+    """
+    Run counters for a generator or validator script, to find the expensive
+    ones.
+    """
+
+    path = models.CharField(max_length=255, unique=True)
+    runs = models.IntegerField(default=0)
+    failures = models.IntegerField(default=0)
+    timeouts = models.IntegerField(default=0)
+    total_elapsed = models.FloatField(default=0)
+    max_elapsed = models.FloatField(default=0)
+    total_cpu = models.FloatField(default=0)
+    max_rss = models.IntegerField(default=0, help_text='KB')
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'script stats'
+
+    def __unicode__(self):
+        return self.path
+
+    def mean_elapsed(self):
+        if not self.runs:
+            return '-'
+        return '%.3fs' % (self.total_elapsed / self.runs)
+
+    @classmethod
+    def record(cls, result):
+        """
+        Add an ExecResult to the counters of its script.
+        """
+        path = os.path.relpath(result.path, settings.MEDIA_ROOT)
+        stats, created = cls.objects.get_or_create(path=path)
+        qs = cls.objects.filter(id=stats.id)
+        qs.update(
+            runs=F('runs') + 1,
+            failures=F('failures') + (1 if result.status else 0),
+            timeouts=F('timeouts') + (1 if result.timed_out else 0),
+            total_elapsed=F('total_elapsed') + result.elapsed,
+            total_cpu=F('total_cpu') + (result.cpu_time or 0),
+            updated=datetime.now(),
+        )
+        qs.filter(max_elapsed__lt=result.elapsed).update(max_elapsed=result.elapsed)
+        if result.peak_rss:
+            qs.filter(max_rss__lt=result.peak_rss).update(max_rss=result.peak_rss)
+
+class SlowRequest(models.Model):
+    """
+    A request that took longer than PQ_PROFILE_SLOW_MS, with its time
+    breakdown in milliseconds. See pq.profiling.
+    """
+
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=255)
+    view = models.CharField(max_length=100, blank=True)
+    status = models.IntegerField()
+    total = models.FloatField(db_index=True)
+    db_time = models.FloatField()
+    db_queries = models.IntegerField()
+    script_time = models.FloatField()
+    script_runs = models.IntegerField()
+    render_time = models.FloatField()
+    created = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __unicode__(self):
+        return '%s %s' % (self.method, self.path)
+
+class GenerationJob(models.Model):
+    """
+    A queued request to generate a new input for a solution, picked up by the
+    genworker management command.
+    """
+
+    solution = models.ForeignKey(Solution)
+    status = models.IntegerField(choices=JOB_STATUS_CHOICES, default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+    error = models.TextField(blank=True)
+
+    def __unicode__(self):
+        return 'Job %d (%s)' % (self.id, self.get_status_display())
+
+    def position(self):
+        """
+        Number of queued jobs ahead of this one.
+        """
+        if self.status != 0:
+            return 0
+        return GenerationJob.objects.filter(status=0, id__lt=self.id).count()
+
+# connect the cache invalidation receivers
+from pq import caching, database
+if database.PERSISTENT_CONNECTIONS:
+    database.keep_connections()
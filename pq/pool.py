@@ -0,0 +1,80 @@
+"""
+Pool of pre-generated inputs.
+
+Running the generator and validator scripts inside a request is slow, and at
+the start of a contest everybody asks for an input at once. The pool keeps a
+number of ready-made input/output pairs per challenge set, which are refilled
+in the background by the `fillpool` management command.
+
+Challenges with a seeded generator are not pooled, since their data is not
+stored.
+"""
+from django.conf import settings
+from django.db.models import F
+from pq.models import Challenge, PooledInput, PoolStats
+
+POOL_DEPTH = getattr(settings, 'PQ_POOL_DEPTH', 10)
+
+
+def take(challenge, set):
+    """
+    Atomically claim a pooled pair for a set. Returns None if the pool is empty.
+    """
+    if challenge.seeded_generator:
+        return None
+    candidates = PooledInput.objects.filter(challenge=challenge, set=set, claimed=False).order_by('id')
+    for entry in candidates[:5]:
+        # only one request can flip the claimed flag, the others try the next entry
+        if PooledInput.objects.filter(id=entry.id, claimed=False).update(claimed=True):
+            entry.delete()
+            return entry
+    return None
+
+
+def record(challenge, set, hit):
+    """
+    Update the hit/miss counters for a set.
+    """
+    stats, created = PoolStats.objects.get_or_create(challenge=challenge, set=set)
+    if hit:
+        PoolStats.objects.filter(id=stats.id).update(hits=F('hits') + 1)
+    else:
+        PoolStats.objects.filter(id=stats.id).update(misses=F('misses') + 1)
+
+
+def generate(solution):
+    """
+    Give a solution a fresh input, from the pool if possible, falling back to
+    running the scripts inline. Returns the generated input.
+    """
+    if solution.challenge.seeded_generator:
+        return solution.generate()
+    entry = take(solution.challenge, solution.set)
+    record(solution.challenge, solution.set, entry is not None)
+    if entry:
+        return solution.generate(entry)
+    return solution.generate()
+
+
+def fill(challenge, set, depth=POOL_DEPTH):
+    """
+    Top up the pool for a set. Returns the number of pairs generated.
+    """
+    n = depth - PooledInput.objects.filter(challenge=challenge, set=set, claimed=False).count()
+    for i in range(n):
+        input_gen, output_gen = challenge.generate(set)
+        PooledInput.objects.create(challenge=challenge, set=set, input_gen=input_gen, output_gen=output_gen)
+    return max(n, 0)
+
+
+def fill_all(depth=POOL_DEPTH):
+    """
+    Top up the pools of every challenge in progress.
+    """
+    n = 0
+    for challenge in Challenge.objects.filter(status=2):
+        if not challenge.generator or not challenge.validator or challenge.seeded_generator:
+            continue
+        for set in challenge.sets.all():
+            n += fill(challenge, set, depth)
+    return n
@@ -0,0 +1,193 @@
+"""
+Per-request profiling.
+
+ProfilingMiddleware breaks the time of every request down into database
+queries, generator/validator script runs and template rendering. The numbers
+go out in a Server-Timing header and a json log line on the pq.profiling
+logger, and requests slower than PQ_PROFILE_SLOW_MS are kept as SlowRequest
+rows for the admin: the PQ_PROFILE_SLOW_KEEP slowest of the last
+PQ_PROFILE_WINDOW_HOURS. Rows older than that are pruned every PRUNE_EVERY
+saves rather than on each one.
+
+Counting is done in thread-local counters, with a thin cursor wrapper for the
+queries and a wrapper around Template.render, so it is cheap enough to leave
+on in production.
+"""
+import itertools
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db import connections
+from django.db.backends.util import CursorWrapper
+from django.template.base import Template
+
+SLOW_MS = getattr(settings, 'PQ_PROFILE_SLOW_MS', 500)
+WINDOW_HOURS = getattr(settings, 'PQ_PROFILE_WINDOW_HOURS', 24)
+SLOW_KEEP = getattr(settings, 'PQ_PROFILE_SLOW_KEEP', 200)
+PRUNE_EVERY = 100
+
+logger = logging.getLogger('pq.profiling')
+
+local = threading.local()
+
+saves = itertools.count(1)
+
+
+def start():
+    local.counters = {}
+    local.render_depth = 0
+
+
+def stop():
+    counters = getattr(local, 'counters', None)
+    local.counters = None
+    return counters
+
+
+def add(name, elapsed, count=1):
+    """
+    Count time spent on something in the current request. Does nothing
+    outside of a profiled request.
+    """
+    counters = getattr(local, 'counters', None)
+    if counters is not None:
+        total, n = counters.get(name, (0.0, 0))
+        counters[name] = (total + elapsed, n + count)
+
+
+class TimedCursor(CursorWrapper):
+    """
+    Cursor wrapper that counts the queries and their time.
+    """
+    def execute(self, sql, params=()):
+        self.set_dirty()
+        start = time.time()
+        try:
+            return self.cursor.execute(sql, params)
+        finally:
+            add('db', time.time() - start)
+
+    def executemany(self, sql, param_list):
+        self.set_dirty()
+        start = time.time()
+        try:
+            return self.cursor.executemany(sql, param_list)
+        finally:
+            add('db', time.time() - start)
+
+
+def timed_cursor(connection, debug):
+    # if the connection was logging queries, Django's query log keeps working
+    # underneath
+    def make_cursor(cursor):
+        if debug:
+            cursor = type(connection).make_debug_cursor(connection, cursor)
+        return TimedCursor(cursor, connection)
+    return make_cursor
+
+
+template_render = Template.render
+
+def timed_render(self, context):
+    # included templates are rendered inside their parent, only the
+    # outermost render is timed
+    depth = getattr(local, 'render_depth', 0)
+    if depth:
+        local.render_depth += 1
+        try:
+            return template_render(self, context)
+        finally:
+            local.render_depth -= 1
+    local.render_depth = 1
+    start = time.time()
+    try:
+        return template_render(self, context)
+    finally:
+        local.render_depth = 0
+        add('render', time.time() - start)
+
+
+def server_timing(counters, total):
+    parts = []
+    for name in ('db', 'script', 'render'):
+        elapsed, n = counters.get(name, (0.0, 0))
+        parts.append('%s;dur=%.1f;desc="%d"' % (name, elapsed * 1000, n))
+    parts.append('total;dur=%.1f' % (total * 1000))
+    return ', '.join(parts)
+
+
+class ProfilingMiddleware(object):
+    """
+    Put this first in MIDDLEWARE_CLASSES, so the total covers the other
+    middleware.
+    """
+    def __init__(self):
+        Template.render = timed_render
+
+    def process_request(self, request):
+        start()
+        request._profile_start = time.time()
+        request._profile_cursors = []
+        for connection in connections.all():
+            debug = connection.use_debug_cursor or (connection.use_debug_cursor is None and settings.DEBUG)
+            request._profile_cursors.append((connection, connection.use_debug_cursor))
+            connection.make_debug_cursor = timed_cursor(connection, debug)
+            connection.use_debug_cursor = True
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._profile_view = '%s.%s' % (view_func.__module__, view_func.__name__)
+
+    def process_response(self, request, response):
+        counters = stop()
+        if counters is None or not hasattr(request, '_profile_start'):
+            return response
+        for connection, use_debug_cursor in request._profile_cursors:
+            connection.use_debug_cursor = use_debug_cursor
+            del connection.make_debug_cursor
+
+        total = time.time() - request._profile_start
+        response['Server-Timing'] = server_timing(counters, total)
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request, '_profile_view', None),
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+        }
+        for name in ('db', 'script', 'render'):
+            elapsed, n = counters.get(name, (0.0, 0))
+            record['%s_ms' % name] = round(elapsed * 1000, 1)
+            record['%s_count' % name] = n
+        logger.info(json.dumps(record, sort_keys=True))
+
+        if record['total_ms'] >= SLOW_MS:
+            save_slow_request(record)
+        return response
+
+
+def save_slow_request(record):
+    """
+    Keep a slow request if it is among the SLOW_KEEP slowest.
+    """
+    from pq.models import SlowRequest
+    if next(saves) % PRUNE_EVERY == 0:
+        prune_slow_requests()
+    slowest = SlowRequest.objects.order_by('-total', '-id')
+    nth = list(slowest.values_list('total', flat=True)[SLOW_KEEP - 1:SLOW_KEEP])
+    if nth and record['total_ms'] <= nth[0]:
+        return
+    SlowRequest.objects.create(method=record['method'], path=record['path'][:255],
+        view=record['view'] or '', status=record['status'], total=record['total_ms'],
+        db_time=record['db_ms'], db_queries=record['db_count'], script_time=record['script_ms'],
+        script_runs=record['script_count'], render_time=record['render_ms'])
+    if nth:
+        SlowRequest.objects.filter(id__in=list(slowest.values_list('id', flat=True)[SLOW_KEEP:])).delete()
+
+
+def prune_slow_requests():
+    from pq.models import SlowRequest
+    SlowRequest.objects.filter(created__lt=datetime.now() - timedelta(hours=WINDOW_HOURS)).delete()
@@ -0,0 +1,23 @@
+"""
+Trivial generator and validator scripts, for the tests and the benchmark
+commands. The generator prints random numbers, the validator doubles them.
+"""
+
+GENERATOR = """
+import random, sys
+for i in range(int(sys.argv[1]) * %d):
+    print(random.randint(0, 1000))
+"""
+
+VALIDATOR = """
+import sys
+for line in sys.stdin:
+    print(int(line) * 2)
+"""
+
+
+def generator(numbers_per_set):
+    """
+    Source of a generator that prints numbers_per_set numbers times the set id.
+    """
+    return GENERATOR % numbers_per_set
@@ -0,0 +1,172 @@
+"""
+Resource limits for generator and validator scripts.
+
+Scripts run with rlimits on CPU time, address space and file size, a
+wall-clock timeout and a cap on their output. At most CONCURRENCY scripts run
+at once per server process; further calls wait for a free slot. Every run
+returns an ExecResult with its exit status, elapsed and CPU time and peak
+resident memory.
+
+The rlimits need the resource module, so they only apply on unix.
+"""
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from subprocess import Popen, PIPE, CalledProcessError
+from django.conf import settings
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+CPU_SECONDS = getattr(settings, 'PQ_SANDBOX_CPU_SECONDS', 30)
+MEMORY = getattr(settings, 'PQ_SANDBOX_MEMORY', 1024 ** 3)
+OUTPUT_SIZE = getattr(settings, 'PQ_SANDBOX_OUTPUT_SIZE', 256 * 1024 ** 2)
+TIMEOUT = getattr(settings, 'PQ_SANDBOX_TIMEOUT', 60)
+CONCURRENCY = getattr(settings, 'PQ_SANDBOX_CONCURRENCY', multiprocessing.cpu_count())
+
+CHUNK_SIZE = 64 * 1024
+ERROR_SIZE = 4096
+
+slots = threading.BoundedSemaphore(CONCURRENCY)
+
+
+class ScriptTimeout(CalledProcessError):
+    pass
+
+
+class ExecResult(object):
+    """
+    Outcome of one script run. peak_rss is in kilobytes, and None where it
+    can't be measured.
+    """
+    def __init__(self, path, status, output, elapsed, cpu_time=None, peak_rss=None,
+            timed_out=False, error=None):
+        self.path = path
+        self.status = status
+        self.output = output
+        self.elapsed = elapsed
+        self.cpu_time = cpu_time
+        self.peak_rss = peak_rss
+        self.timed_out = timed_out
+        self.error = error
+
+    def __repr__(self):
+        return '<ExecResult %s status=%s elapsed=%.2fs rss=%s>' % (
+            os.path.basename(self.path), self.status, self.elapsed, self.peak_rss)
+
+    def check(self):
+        """
+        Return the output, or raise CalledProcessError if the script failed.
+        """
+        if self.timed_out:
+            raise ScriptTimeout(self.status, self.path, self.error)
+        if self.status:
+            raise CalledProcessError(self.status, self.path, self.error)
+        return self.output
+
+
+def set_limits(cpu_seconds=CPU_SECONDS, memory=MEMORY, file_size=OUTPUT_SIZE):
+    """
+    Apply rlimits to the current process. A limit of None is left alone.
+    """
+    if resource is None:
+        return
+    if cpu_seconds:
+        # the soft limit sends SIGXCPU, the hard limit a second later SIGKILL
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    if memory:
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    if file_size:
+        resource.setrlimit(resource.RLIMIT_FSIZE, (file_size, file_size))
+
+
+def kill(process):
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+def wait(process):
+    """
+    Reap a process, returning its exit status and resource usage.
+    """
+    if not hasattr(os, 'wait4'):
+        return process.wait(), None
+    pid, status, usage = os.wait4(process.pid, 0)
+    if os.WIFSIGNALED(status):
+        process.returncode = -os.WTERMSIG(status)
+    else:
+        process.returncode = os.WEXITSTATUS(status)
+    return process.returncode, usage
+
+
+def write_input(process, input):
+    # the script may exit without reading all of its input
+    try:
+        process.stdin.write(input)
+    except IOError:
+        pass
+    try:
+        process.stdin.close()
+    except IOError:
+        pass
+
+
+def read_error(f):
+    # the end of stderr, where the traceback is
+    f.seek(0, os.SEEK_END)
+    f.seek(max(0, f.tell() - ERROR_SIZE))
+    return f.read() or None
+
+
+def execute(path, args=(), input='', timeout=TIMEOUT, max_output=OUTPUT_SIZE):
+    """
+    Run a script in a fresh interpreter under the sandbox limits.
+    """
+    with slots, tempfile.TemporaryFile() as stderr:
+        start = time.time()
+        process = Popen(['python', path] + list(args), stdin=PIPE, stdout=PIPE, stderr=stderr,
+            preexec_fn=set_limits if resource else None, close_fds=True)
+        timed_out = []
+        def on_timeout():
+            timed_out.append(True)
+            kill(process)
+        timer = threading.Timer(timeout, on_timeout)
+        timer.start()
+        writer = threading.Thread(target=write_input, args=(process, input))
+        writer.start()
+
+        chunks, size, error = [], 0, None
+        while True:
+            chunk = process.stdout.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_output:
+                error = 'Output exceeded %d bytes.' % max_output
+                kill(process)
+                break
+            chunks.append(chunk)
+        process.stdout.close()
+        writer.join()
+        status, usage = wait(process)
+        timer.cancel()
+        elapsed = time.time() - start
+        if status and not error:
+            error = read_error(stderr)
+
+    if timed_out:
+        error = 'Timed out after %d seconds.' % timeout
+    if error and not status:
+        status = 1
+    result = ExecResult(path, status, ''.join(chunks), elapsed,
+        timed_out=bool(timed_out), error=error)
+    if usage:
+        result.cpu_time = usage.ru_utime + usage.ru_stime
+        result.peak_rss = usage.ru_maxrss
+    return result
@@ -0,0 +1,126 @@
+"""
+Materialized challenge scoreboards and the global leaderboard.
+
+Score rows are updated whenever a solution is completed, so showing a
+scoreboard is a single indexed query instead of aggregating over every
+solution of the challenge. Ranking rows sum up each user's scores over all
+challenges in the same way.
+"""
+from django.db.models import Sum, Count
+from pq.models import Score, Ranking, Solution
+from pq import database
+
+SolutionBonus = Solution.bonuses.through
+
+
+def solution_label(solution):
+    return '%d:%s' % (solution.id, solution.set.title.lower()[:3])
+
+
+def make_score(challenge, user_id, solutions, bonus_points):
+    points = sum(s.set.points for s in solutions)
+    return Score(
+        challenge=challenge,
+        user_id=user_id,
+        points=points,
+        bonus_points=bonus_points,
+        total=points + bonus_points,
+        solutions=' '.join(solution_label(s) for s in solutions),
+    )
+
+
+def update_score(challenge, user):
+    """
+    Recompute the score row of one user, and their ranking. Call this inside
+    the transaction that completes the solution.
+    """
+    solutions = list(challenge.solution_set.filter(author=user, status=2).select_related('set').order_by('id'))
+    if not solutions:
+        Score.objects.filter(challenge=challenge, user=user).delete()
+        update_ranking(user)
+        return None
+
+    bonus_points = SolutionBonus.objects.filter(solution__in=solutions).aggregate(
+        points=Sum('bonus__points'))['points'] or 0
+    score = make_score(challenge, user.id, solutions, bonus_points)
+    try:
+        score.id = Score.objects.get(challenge=challenge, user=user).id
+    except Score.DoesNotExist:
+        pass
+    score.save()
+    update_ranking(user)
+    return score
+
+
+def rebuild(challenge):
+    """
+    Recompute every score row of a challenge from scratch.
+    """
+    solutions = {}
+    for s in challenge.solution_set.filter(status=2).select_related('set').order_by('id'):
+        solutions.setdefault(s.author_id, []).append(s)
+
+    bonuses = SolutionBonus.objects.filter(solution__challenge=challenge, solution__status=2)
+    bonus_points = {}
+    for row in bonuses.values('solution__author').annotate(points=Sum('bonus__points')):
+        bonus_points[row['solution__author']] = row['points'] or 0
+
+    Score.objects.filter(challenge=challenge).delete()
+    Score.objects.bulk_create([make_score(challenge, user_id, user_solutions, bonus_points.get(user_id, 0))
+        for user_id, user_solutions in solutions.items()])
+    return len(solutions)
+
+
+def update_ranking(user):
+    """
+    Recompute the leaderboard total of one user.
+    """
+    totals = Score.objects.filter(user=user).aggregate(total=Sum('total'), challenges=Count('id'))
+    if not totals['challenges']:
+        Ranking.objects.filter(user=user).delete()
+        return None
+    ranking, created = Ranking.objects.get_or_create(user=user)
+    ranking.total, ranking.challenges = totals['total'], totals['challenges']
+    ranking.save()
+    return ranking
+
+
+def rebuild_rankings():
+    """
+    Recompute the whole leaderboard from the score rows.
+    """
+    totals = Score.objects.values('user').annotate(total=Sum('total'), challenges=Count('id'))
+    Ranking.objects.all().delete()
+    Ranking.objects.bulk_create([Ranking(user_id=row['user'], total=row['total'], challenges=row['challenges'])
+        for row in totals])
+    return len(totals)
+
+
+def get_scoreboard(challenge):
+    """
+    Score rows of a challenge, best first, from the read replica.
+    """
+    with database.replica():
+        return list(Score.objects.filter(challenge=challenge).select_related('user').order_by('-total', 'user'))
+
+
+def get_leaderboard(start=0, count=50):
+    """
+    Rankings start+1 to start+count of the leaderboard, each with its rank.
+    Tied users share a rank.
+    """
+    rankings = list(Ranking.objects.select_related('user').order_by('-total', 'user')[start:start + count])
+    for i, ranking in enumerate(rankings):
+        if i and ranking.total == rankings[i - 1].total:
+            ranking.rank = rankings[i - 1].rank
+        else:
+            ranking.rank = get_rank(ranking) if i == 0 else start + i + 1
+    return rankings
+
+
+def get_rank(ranking):
+    """
+    Rank of a user on the leaderboard, one more than the number of users with
+    a higher total.
+    """
+    return Ranking.objects.filter(total__gt=ranking.total).count() + 1
@@ -0,0 +1,95 @@
+"""
+Long-lived process that runs a single generator or validator script over and
+over. Started by pq.workers, it is not meant to be run by hand and does not
+import django, so the script sees the same environment as a fresh interpreter.
+
+Usage: python scriptworker.py <script path> <max jobs>
+
+Each job is a header line of json {"args": [...], "size": n} followed by n bytes
+of stdin. The reply is a header line {"status": code, "size": n, "error": ...,
+"cpu": seconds, "rss": kilobytes} followed by n bytes of stdout. The cpu time
+is that of the job; the peak rss is that of the worker so far.
+"""
+import io
+import json
+import sys
+import traceback
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    StringIO = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PY3 = sys.version_info[0] >= 3
+
+
+def run(code, path, args, data):
+    # the script gets its own __main__ namespace and redirected std streams
+    namespace = {'__name__': '__main__', '__file__': path}
+    stdin, stdout, argv = sys.stdin, sys.stdout, sys.argv
+    if PY3:
+        sys.stdin = io.StringIO(data.decode('utf-8'))
+        sys.stdout = io.StringIO()
+    else:
+        # json gives unicode args, but a script run by hand gets str, and
+        # print may be given either
+        args = [arg.encode('utf-8') if isinstance(arg, unicode) else arg for arg in args]
+        sys.stdin = io.BytesIO(data)
+        sys.stdout = StringIO()
+    sys.argv = [path] + list(args)
+    status, error = 0, None
+    try:
+        exec(code, namespace)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            status, error = 1 if not isinstance(e.code, int) else e.code, str(e.code)
+    except Exception:
+        status, error = 1, traceback.format_exc()
+    finally:
+        output = sys.stdout.getvalue()
+        sys.stdin, sys.stdout, sys.argv = stdin, stdout, argv
+    if PY3 or isinstance(output, unicode):
+        output = output.encode('utf-8')
+    return status, error, output
+
+
+def usage():
+    if resource is None:
+        return 0.0, None
+    r = resource.getrusage(resource.RUSAGE_SELF)
+    return r.ru_utime + r.ru_stime, r.ru_maxrss
+
+
+def main():
+    path, max_jobs = sys.argv[1], int(sys.argv[2])
+    with open(path) as f:
+        code = compile(f.read(), path, 'exec')
+
+    if PY3:
+        pipe_in, pipe_out = sys.stdin.buffer, sys.stdout.buffer
+    else:
+        pipe_in, pipe_out = sys.stdin, sys.stdout
+
+    for i in range(max_jobs):
+        header = pipe_in.readline()
+        if not header:
+            break
+        job = json.loads(header.decode('utf-8'))
+        data = pipe_in.read(job['size'])
+        cpu_start = usage()[0]
+        status, error, output = run(code, path, job['args'], data)
+        cpu, rss = usage()
+        reply = json.dumps({'status': status, 'size': len(output), 'error': error,
+            'cpu': cpu - cpu_start, 'rss': rss})
+        pipe_out.write(reply.encode('utf-8') + b'\n')
+        pipe_out.write(output)
+        pipe_out.flush()
+
+
+if __name__ == '__main__':
+    main()
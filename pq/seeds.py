@@ -0,0 +1,90 @@
+"""
+Seeded generation.
+
+A challenge with a seeded generator passes each solution attempt its own seed
+as the generator's second argument, and the generated data only depends on
+the set and that seed. Such solutions store their seed and digests but not the
+data itself: the input and expected output are regenerated when they are
+needed, which is at download and at verification. Recently generated pairs
+are kept in a bounded LRU cache for that window.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from django.conf import settings
+
+CACHE_SIZE = getattr(settings, 'PQ_SEED_CACHE_SIZE', 256 * 1024 ** 2)
+
+
+class SeedMismatch(Exception):
+    """
+    Regenerating from a seed gave a different input than the one handed out.
+    """
+
+
+class LRUCache(object):
+    """
+    Thread-safe LRU cache bounded by the total size of its values.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.items.pop(key, None)
+            if item is None:
+                return None
+            self.items[key] = item
+            return item[0]
+
+    def set(self, key, value, size):
+        if size > self.max_size:
+            return
+        with self.lock:
+            if key in self.items:
+                self.size -= self.items.pop(key)[1]
+            self.items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_size:
+                key, (value, size) = self.items.popitem(last=False)
+                self.size -= size
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.size = 0
+
+
+cache = LRUCache(CACHE_SIZE)
+
+
+def make_seed(solution):
+    """
+    Seed for the current attempt of a solution. It can't be guessed without
+    the secret key.
+    """
+    key = '%s:%d:%d:%d:%d' % (settings.SECRET_KEY, solution.challenge_id, solution.set_id,
+        solution.author_id, solution.attempt)
+    return int(hashlib.sha1(key).hexdigest()[:8], 16) & 0x7fffffff
+
+
+def generate(challenge, set, seed, input_digest=None):
+    """
+    Input and expected output for a seed, from the cache or by running the
+    scripts. If input_digest is given, a regenerated input must match it.
+    """
+    # a changed generator makes older cached pairs unreachable
+    key = (challenge.id, set.id, seed, os.path.getmtime(challenge.generator.path))
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    input_gen, output_gen = challenge.generate(set, seed)
+    if input_digest and hashlib.sha1(input_gen).hexdigest() != input_digest:
+        raise SeedMismatch('The generator of %s gave a different input for seed %d.' % (challenge, seed))
+    cache.set(key, (input_gen, output_gen), len(input_gen) + len(output_gen))
+    return input_gen, output_gen
@@ -0,0 +1,227 @@
+"""
+Serving stored files.
+
+Files are streamed from disk with an ETag from their content hash and a
+Last-Modified date, so repeat downloads get a 304. Clients that accept gzip
+get a precompressed copy kept next to the file, and single byte ranges are
+answered with 206 Partial Content, so interrupted downloads can resume. Range
+headers asking for anything else are ignored, and the whole file is sent.
+
+With PQ_SENDFILE set, the transfer itself is left to the front proxy: the
+response only carries an X-Sendfile header with the file path (Apache
+mod_xsendfile, lighttpd), or an X-Accel-Redirect header with an internal URL
+(nginx). For X-Accel-Redirect, PQ_SENDFILE_ROOTS maps directories to the
+internal URL prefixes they are served under.
+"""
+import gzip
+import hashlib
+import os
+import re
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, quote_etag, urlquote
+from django.views.static import was_modified_since
+
+SENDFILE = getattr(settings, 'PQ_SENDFILE', None)
+SENDFILE_ROOTS = getattr(settings, 'PQ_SENDFILE_ROOTS', ())
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# parse_range() of a range that starts past the end of the file
+UNSATISFIABLE = 'unsatisfiable'
+
+
+def file_digest(f):
+    """
+    sha1 of a file object's content, read in chunks from the start.
+    """
+    sha = hashlib.sha1()
+    f.seek(0)
+    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+        sha.update(chunk)
+    f.seek(0)
+    return sha.hexdigest()
+
+
+def gzip_path(path):
+    return path + '.gz'
+
+
+def write_gzip(path):
+    """
+    Store a compressed copy of a file next to it.
+    """
+    tmp = gzip_path(path) + '.tmp'
+    with open(path, 'rb') as src:
+        with gzip.open(tmp, 'wb', compresslevel=9) as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                dst.write(chunk)
+    os.rename(tmp, gzip_path(path))
+
+
+def remove_gzip(path):
+    if os.path.exists(gzip_path(path)):
+        os.remove(gzip_path(path))
+
+
+def iter_file(path, start=0, length=None):
+    """
+    Yield length bytes of a file from offset start, or up to the end.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length is None or length > 0:
+            chunk = f.read(CHUNK_SIZE if length is None else min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            if length is not None:
+                length -= len(chunk)
+            yield chunk
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single byte range, inclusive. UNSATISFIABLE if the range
+    lies past the end of the file, and None if the header is to be ignored:
+    several ranges, other units or a malformed range.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # a suffix range: the last n bytes
+        if not int(last) or not size:
+            return UNSATISFIABLE
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return UNSATISFIABLE
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def accepts_gzip(request):
+    return 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+
+def sendfile_url(path):
+    """
+    Internal URL of a file for X-Accel-Redirect, or None if it is not below
+    one of PQ_SENDFILE_ROOTS.
+    """
+    path = os.path.abspath(path)
+    for root, prefix in SENDFILE_ROOTS:
+        root = os.path.abspath(root)
+        if path.startswith(root + os.sep):
+            return prefix.rstrip('/') + '/' + urlquote(os.path.relpath(path, root).replace(os.sep, '/'))
+    return None
+
+
+def offload(path, content_type):
+    """
+    Empty response that has the front proxy send a file, or None if there
+    is no proxy to send it.
+    """
+    if SENDFILE == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = os.path.abspath(path)
+        return response
+    if SENDFILE == 'x-accel-redirect':
+        url = sendfile_url(path)
+        if url:
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = url
+            return response
+    return None
+
+
+def serve_gzip(path, content_type='text/plain', filename=None):
+    """
+    Send a gzip file as is, to be decompressed by the client.
+    """
+    response = offload(path, content_type)
+    if response is None:
+        response = StreamingHttpResponse(iter_file(path), content_type=content_type)
+        response['Content-Length'] = os.path.getsize(path)
+    response['Content-Encoding'] = 'gzip'
+    if filename:
+        response['Content-Disposition'] = 'attachment; filename=%s' % filename
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def serve_file(request, path, digest=None, content_type='text/plain', filename=None, max_age=300,
+        public=True):
+    """
+    Stream a file as a conditional, compressible, rangeable response. Without
+    a content digest, the ETag is made from the modification time and size.
+    Files that are not public are kept out of shared caches.
+    """
+    stat = os.stat(path)
+    if digest is None:
+        digest = '%x-%x' % (int(stat.st_mtime), stat.st_size)
+    etag = quote_etag(digest)
+    last_modified = http_date(stat.st_mtime)
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        etags = parse_etags(if_none_match)
+        not_modified = digest in etags or '%s-gz' % digest in etags or '*' in etags
+    else:
+        not_modified = not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime)
+    if not_modified:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        return response
+
+    if SENDFILE:
+        # the proxy does ranges, and compression from the .gz copy with
+        # gzip_static
+        response = offload(path, content_type)
+        if response is not None:
+            return finish(response, etag, last_modified, filename, max_age, public)
+
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and if_range and if_range not in (etag, last_modified):
+        # the client's partial copy is stale, it gets the whole file
+        range_header = None
+
+    byte_range = parse_range(range_header, stat.st_size) if range_header else None
+    if byte_range == UNSATISFIABLE:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */%d' % stat.st_size
+        return response
+    if byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(iter_file(path, start, end - start + 1),
+            status=206, content_type=content_type)
+        response['Content-Range'] = 'bytes %d-%d/%d' % (start, end, stat.st_size)
+        response['Content-Length'] = end - start + 1
+    elif accepts_gzip(request) and os.path.exists(gzip_path(path)):
+        etag = quote_etag('%s-gz' % digest)
+        response = StreamingHttpResponse(iter_file(gzip_path(path)), content_type=content_type)
+        response['Content-Encoding'] = 'gzip'
+        response['Content-Length'] = os.path.getsize(gzip_path(path))
+    else:
+        response = StreamingHttpResponse(iter_file(path), content_type=content_type)
+        response['Content-Length'] = stat.st_size
+    return finish(response, etag, last_modified, filename, max_age, public)
+
+
+def finish(response, etag, last_modified, filename, max_age, public):
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    response['Accept-Ranges'] = 'bytes'
+    if filename:
+        response['Content-Disposition'] = 'attachment; filename=%s' % filename
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if public:
+        patch_cache_control(response, public=True, max_age=max_age)
+    else:
+        patch_cache_control(response, private=True, max_age=max_age)
+    return response
@@ -0,0 +1,7 @@
+"""
+Signals sent by pq.
+"""
+from django.dispatch import Signal
+
+# sent once a solution has been verified and its score updated
+solution_completed = Signal(providing_args=['solution'])
@@ -40,25 +40,69 @@ Timer.prototype.display = function(ms) {
 $(document).ready(function(){
 
 
-    // TODO: ajax refesh this content instead of reloading the whole page
-    $(".btn-refresh").click(function(e){
-        $(this).html('Downloading...');
-        window.setTimeout(function(){
-            location.reload(true);
-        }, 5000);
-    });
+    // ask the server what changed on the challenge page, and swap in the
+    // set buttons and scoreboard that did instead of reloading the page
+    var state = $("#challenge-state");
+    var state_timer = null;
+
+    function refresh_state() {
+        if (!state.length)
+            return;
+        window.clearTimeout(state_timer);
+        var params = {scoreboard: $("#scoreboard").data("version")};
+        $(".set[data-set]").each(function(i, el) {
+            params["set-" + $(el).data("set")] = $(el).data("state");
+        });
+        $.getJSON(state.data("url"), params, function(data) {
+            $.each(data.sets, function(id, set) {
+                var el = $(set.html);
+                $(".set[data-set=" + id + "]").replaceWith(el);
+                start_timers(el);
+            });
+            if (data.scoreboard) {
+                $("#scoreboard").data("version", data.scoreboard.version).html(data.scoreboard.html);
+            }
+        });
+        state_timer = window.setTimeout(refresh_state, 15000);
+    }
 
-    $(".timer-running span").each(function(i, el) {
-        var str = $(el).html();        
-        var parts = str.split(":");
-        var seconds = parseInt(parts[0]) * 60;
-        seconds += parseInt(parts[1]);                
-        var t = new Timer(this, seconds*1000, function(){ 
-            window.setTimeout(function() {location.reload(true)}, 500);
+    function start_timers(el) {
+        $(el).find(".timer-running span").each(function(i, el) {
+            var str = $(el).html();        
+            var parts = str.split(":");
+            var seconds = parseInt(parts[0]) * 60;
+            seconds += parseInt(parts[1]);                
+            var t = new Timer(this, seconds*1000, function(){ 
+                window.setTimeout(refresh_state, 500);
+            });
+            timer_stack.push(t);
         });
-        timer_stack.push(t);
+    }
+
+    // generate the input in the background, then download it once the job is done
+    function poll_job(button, job) {
+        if (job.status == 'done') {
+            $(button).html('Downloading...');
+            window.location.href = job.download;
+            window.setTimeout(refresh_state, 1000);
+        } else if (job.status == 'failed') {
+            $(button).html('Generation failed, click to retry');
+        } else {
+            $(button).html(job.position ? 'Queued (' + job.position + ' ahead)...' : 'Generating input...');
+            window.setTimeout(function(){
+                $.getJSON(job.url, function(job){ poll_job(button, job); });
+            }, 1000);
+        }
+    }
+
+    $(document).on("click", ".btn-refresh", function(e){
+        var button = this;
+        e.preventDefault();
+        $(button).html('Generating input...');
+        $.getJSON($(button).attr('href'), function(job){ poll_job(button, job); });
     });
 
-    prettyPrint();
+    start_timers(document);
+    state_timer = window.setTimeout(refresh_state, 15000);
 
 });
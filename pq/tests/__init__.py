@@ -0,0 +1,33 @@
+"""
+This file demonstrates writing tests using the unittest module. These will pass
+when you run "manage.py test".
+
+Replace this with more appropriate tests for your application.
+"""
+
+from django.test import TestCase
+
+
+class SimpleTest(TestCase):
+    def test_basic_addition(self):
+        """
+        Tests that 1 + 1 always equals 2.
+        """
+        self.assertEqual(1 + 1, 2)
+
+
+from pq.tests.test_generation import *
+from pq.tests.test_blobstore import *
+from pq.tests.test_verify import *
+from pq.tests.test_comparators import *
+from pq.tests.test_scoreboard import *
+from pq.tests.test_caching import *
+from pq.tests.test_challenge import *
+from pq.tests.test_bonuses import *
+from pq.tests.test_sandbox import *
+from pq.tests.test_profiling import *
+from pq.tests.test_serving import *
+from pq.tests.test_database import *
+from pq.tests.test_queries import *
+from pq.tests.test_export import *
+from pq.tests.test_upgrade import *
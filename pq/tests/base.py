@@ -0,0 +1,48 @@
+"""
+Shared fixtures for the pq tests.
+"""
+import os
+import shutil
+import tempfile
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase
+from django.test.utils import override_settings
+from pq.models import Challenge, Set
+from pq import samplescripts, seeds
+
+
+class ChallengeMixin(object):
+    """
+    Sets up a challenge with a trivial generator and validator in a scratch
+    media directory.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root,
+            PQ_BLOB_ROOT=os.path.join(self.media_root, 'blobs'))
+        self.settings_override.enable()
+        cache.clear()
+        seeds.cache.clear()
+
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'alice')
+        self.sets = [
+            Set.objects.create(title='Basic', points=50, time_limit=300),
+            Set.objects.create(title='Advanced', points=100, time_limit=300),
+        ]
+        self.challenge = Challenge(title='Doubling', author=self.user, status=2,
+            use_input_validation=True, source_req=False, preamble='', body='')
+        self.challenge.generator.save('gen.py', ContentFile(samplescripts.generator(5)), save=False)
+        self.challenge.validator.save('val.py', ContentFile(samplescripts.VALIDATOR), save=False)
+        self.challenge.save()
+        self.challenge.sets.add(*self.sets)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+
+class ChallengeTestCase(ChallengeMixin, TestCase):
+    pass
@@ -0,0 +1,38 @@
+import os
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from pq.models import Solution, PooledInput
+from pq import blobstore
+from pq.tests.base import ChallengeMixin, ChallengeTestCase
+
+
+class BlobStoreTest(ChallengeTestCase):
+
+    def test_identical_data_is_stored_once(self):
+        a = Solution(challenge=self.challenge, author=self.user, set=self.sets[0], input_gen='1\n2\n')
+        b = PooledInput(challenge=self.challenge, set=self.sets[0], input_gen='1\n2\n')
+        self.assertEqual(a.input_digest, b.input_digest)
+        self.assertEqual(a.input_size, 4)
+        self.assertEqual(len(os.listdir(os.path.dirname(blobstore.path(a.input_digest)))), 1)
+        self.assertEqual(b.input_gen, '1\n2\n')
+        self.assertEqual(''.join(blobstore.iter_chunks(a.input_digest, 3)), '1\n2\n')
+
+
+class BlobMigrationTest(ChallengeMixin, TransactionTestCase):
+
+    def test_migrate_text_columns(self):
+        solution = Solution.objects.create(challenge=self.challenge, author=self.user, set=self.sets[0])
+
+        # turn the table back into the old layout with inline text columns
+        cursor = connection.cursor()
+        cursor.execute('ALTER TABLE pq_solution ADD COLUMN input_gen text NOT NULL DEFAULT \'\'')
+        cursor.execute('ALTER TABLE pq_solution ADD COLUMN output_gen text NOT NULL DEFAULT \'\'')
+        cursor.execute("UPDATE pq_solution SET input_gen = '3\n', output_gen = '6\n'")
+
+        call_command('migrateblobs', stdout=open(os.devnull, 'w'))
+        columns = [c[0] for c in connection.introspection.get_table_description(cursor, 'pq_solution')]
+        self.assertFalse('input_gen' in columns)
+        solution = Solution.objects.get(id=solution.id)
+        self.assertEqual((solution.input_gen, solution.output_gen), ('3\n', '6\n'))
+        self.assertEqual(solution.output_size, 2)
@@ -0,0 +1,80 @@
+import os
+from datetime import datetime, timedelta
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from pq.models import Bonus, Solution
+from pq import bonuses, scoreboard
+from pq.tests.base import ChallengeTestCase
+
+
+class BonusRuleTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(BonusRuleTest, self).setUp()
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'bob')
+        self.now = datetime.now()
+        self.challenge.started = self.now - timedelta(hours=30)
+        self.challenge.save()
+        self.deadline = Bonus.objects.create(title='Speedy', description='', icon='', points=5,
+            rule='deadline', params='{"set": %d, "seconds": 65}' % self.sets[1].id)
+        self.first = Bonus.objects.create(title='First', description='', icon='', points=3,
+            rule='first', params='{"set": %d}' % self.sets[0].id)
+        self.manual = Bonus.objects.create(title='Style', description='', icon='', points=10)
+        self.challenge.bonuses.add(self.deadline, self.first, self.manual)
+
+    def complete(self, user, set, seconds):
+        solution = Solution.objects.create(challenge=self.challenge, author=user, set=set, status=2,
+            generated=self.now - timedelta(seconds=seconds), submitted=self.now)
+        bonuses.apply(solution)
+        return solution
+
+    def earned(self, solution):
+        return set(solution.bonuses.values_list('title', flat=True))
+
+    def test_apply(self):
+        fast = self.complete(self.user, self.sets[1], 30)
+        slow = self.complete(self.bob, self.sets[1], 100)
+        first = self.complete(self.user, self.sets[0], 100)
+        second = self.complete(self.bob, self.sets[0], 100)
+        self.assertEqual(self.earned(fast), set(['Speedy']))
+        self.assertEqual(self.earned(slow), set())
+        self.assertEqual(self.earned(first), set(['First']))
+        self.assertEqual(self.earned(second), set())
+
+    def test_rules_are_cached(self):
+        solution = self.complete(self.user, self.sets[1], 30)
+        solution.bonuses.clear()
+        # only the two queries of bonuses.add
+        with self.assertNumQueries(2):
+            bonuses.apply(solution)
+
+    def test_rule_change_invalidates_cache(self):
+        self.complete(self.user, self.sets[1], 100)
+        self.deadline.params = '{"set": %d, "seconds": 300}' % self.sets[1].id
+        self.deadline.save()
+        self.assertEqual(self.earned(self.complete(self.bob, self.sets[1], 100)), set(['Speedy']))
+
+    def test_rescore(self):
+        solution = self.complete(self.user, self.sets[1], 100)
+        solution.bonuses.add(self.manual)
+        self.complete(self.bob, self.sets[0], 100)
+        scoreboard.rebuild(self.challenge)
+
+        self.deadline.rule = 'earlybird'
+        self.deadline.params = '{"hours": 48}'
+        self.deadline.save()
+        # with an m2m_changed receiver on the through table, the delete
+        # selects the rows first
+        with self.assertNumQueries(7):
+            self.assertEqual(bonuses.rescore(self.challenge), 3)
+        self.assertEqual(self.earned(solution), set(['Speedy', 'Style']))
+
+        call_command('rescore_bonuses', stdout=open(os.devnull, 'w'))
+        totals = dict((r.user_id, r.total) for r in scoreboard.get_scoreboard(self.challenge))
+        self.assertEqual(totals, {self.user.id: 115, self.bob.id: 58})
+
+    def test_clean(self):
+        self.assertRaises(ValidationError, Bonus(rule='deadline', params='{"set": 1}').clean)
+        self.assertRaises(ValidationError, Bonus(rule='first', params='{set: 1}').clean)
+        Bonus(rule='earlybird', params='{"hours": 24}').clean()
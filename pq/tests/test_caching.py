@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from django.template import Context, Template
+from django.test.client import RequestFactory
+from pq.models import Challenge, Solution
+from pq.signals import solution_completed
+from pq import scoreboard, views
+from pq.tests.base import ChallengeTestCase
+
+
+class SidebarCacheTest(ChallengeTestCase):
+
+    def render(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        template = Template('{% load challenges %}{% current_challenges size=1 %}')
+        return template.render(Context({'request': request}))
+
+    def complete(self, set):
+        solution = Solution.objects.create(challenge=self.challenge, author=self.user, set=set,
+            status=2, submitted=datetime.now())
+        scoreboard.update_score(self.challenge, self.user)
+        solution_completed.send(sender=Solution, solution=solution)
+
+    def test_cached_render_runs_no_queries(self):
+        self.render()
+        with self.assertNumQueries(0):
+            self.assertTrue('Doubling' in self.render())
+
+    def test_challenge_save_invalidates(self):
+        self.render()
+        self.challenge.title = 'Tripling'
+        self.challenge.save()
+        self.assertTrue('Tripling' in self.render())
+
+    def test_solution_completion_invalidates(self):
+        self.assertTrue('0 / 200' in self.render())
+        self.complete(self.sets[0])
+        self.assertTrue('50 / 200' in self.render())
+
+
+class ChallengeArchiveTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(ChallengeArchiveTest, self).setUp()
+        now = datetime.now()
+        self.challenge.started = now - timedelta(days=1)
+        self.challenge.save()
+        # two challenges that started at the same time, and an unstarted one
+        for i, days in enumerate([3, 2, 2, 5, None]):
+            challenge = Challenge(title='Archived %d' % i, author=self.user, status=3,
+                started=now - timedelta(days=days) if days else None, preamble='', body='')
+            challenge.save()
+        self.order = list(Challenge.objects.order_by('-started', '-id').values_list('id', flat=True))
+        self.assertEqual(self.order[-1], challenge.id)
+        self.old_page, views.CHALLENGE_PAGE = views.CHALLENGE_PAGE, 2
+
+    def tearDown(self):
+        views.CHALLENGE_PAGE = self.old_page
+        super(ChallengeArchiveTest, self).tearDown()
+
+    def test_pages(self):
+        seen = []
+        url = '/challenge/'
+        while url:
+            response = self.client.get(url)
+            seen.extend(c.id for c in response.context['challenges'])
+            url = '/challenge/?before=%d' % response.context['next'] if response.context['next'] else None
+        self.assertEqual(seen, self.order)
+
+    def test_pages_are_cached(self):
+        url = '/challenge/?before=%d' % self.order[1]
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual([c.id for c in response.context['challenges']], self.order[2:4])
+
+        # the anchor, the page, and the sidebar
+        Challenge.objects.get(id=self.order[2]).save()
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+    def test_unknown_challenge(self):
+        self.assertEqual(self.client.get('/challenge/?before=999').status_code, 404)
+        self.assertEqual(self.client.get('/challenge/?before=x').status_code, 200)
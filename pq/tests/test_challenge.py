@@ -0,0 +1,101 @@
+import json
+from datetime import datetime
+from pq.models import Bonus, Solution
+from pq import buttons, caching, progress, scoreboard
+from pq.tests.base import ChallengeTestCase
+
+
+class ChallengeMarkdownTest(ChallengeTestCase):
+
+    def test_markdown_rendered_on_save(self):
+        self.challenge.preamble = 'Some *emphasis*'
+        self.challenge.save()
+        self.assertEqual(self.challenge.preamble_html, '<p>Some <em>emphasis</em></p>')
+        response = self.client.get('/challenge/%d/' % self.challenge.id)
+        self.assertContains(response, '<p>Some <em>emphasis</em></p>')
+
+
+class ChallengeStateTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(ChallengeStateTest, self).setUp()
+        self.client.login(username='alice', password='alice')
+        self.url = '/challenge/%d/state/' % self.challenge.id
+
+    def state(self, **params):
+        return json.loads(self.client.get(self.url, params).content)
+
+    def test_only_changed_parts_are_sent(self):
+        data = self.state()
+        basic, advanced = [str(s.id) for s in self.sets]
+        self.assertEqual(data['sets'][basic]['state'], 'OpenButton-0')
+        self.assertEqual(data['sets'][advanced]['state'], 'LockedButton-0')
+        self.assertTrue('data-set="%s"' % basic in data['sets'][basic]['html'])
+
+        unchanged = {'set-' + basic: 'OpenButton-0', 'set-' + advanced: 'LockedButton-0',
+            'scoreboard': data['scoreboard']['version']}
+        self.assertEqual(self.state(**unchanged), {'sets': {}})
+
+        solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0])
+        solution.generate()
+        solution.save()
+        self.assertEqual(self.state(**unchanged)['sets'].keys(), [basic])
+        self.assertEqual(self.state(**unchanged)['sets'][basic]['state'], 'RunningButton-1')
+
+    def test_scoreboard_change(self):
+        version = self.state()['scoreboard']['version']
+        Solution.objects.create(challenge=self.challenge, author=self.user, set=self.sets[0], status=2)
+        scoreboard.update_score(self.challenge, self.user)
+        data = self.state(scoreboard=version)
+        self.assertNotEqual(data['scoreboard']['version'], version)
+        self.assertTrue('alice' in data['scoreboard']['html'])
+
+
+class ProgressTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(ProgressTest, self).setUp()
+        self.bonus = Bonus.objects.create(title='Style', description='', icon='', points=10)
+        self.challenge.bonuses.add(self.bonus)
+        self.client.login(username='alice', password='alice')
+
+    def complete(self, set):
+        return Solution.objects.create(challenge=self.challenge, author=self.user, set=set, status=2,
+            generated=datetime.now(), submitted=datetime.now())
+
+    def test_loaded_in_three_queries(self):
+        self.complete(self.sets[0]).bonuses.add(self.bonus)
+        with self.assertNumQueries(3):
+            snapshot = progress.load(self.challenge, self.user)
+        self.assertEqual(snapshot.max_set, self.sets[0].id)
+        self.assertEqual(snapshot.earned, frozenset([self.bonus.id]))
+        with self.assertNumQueries(0):
+            snapshot.solutions[0].get_time_left()
+
+    def test_buttons_are_built_from_the_cache(self):
+        caching.get_progress(self.challenge, self.user)
+        with self.assertNumQueries(0):
+            states = [b.state for b in buttons.get_buttons(self.challenge, self.user)]
+        self.assertEqual(states, ['OpenButton-0', 'LockedButton-0'])
+
+        solution = self.complete(self.sets[0])
+        states = [b.state for b in buttons.get_buttons(self.challenge, self.user)]
+        self.assertEqual(states, ['CompletedButton-0', 'OpenButton-0'])
+
+        solution.bonuses.add(self.bonus)
+        self.assertEqual(caching.get_progress(self.challenge, self.user).earned, frozenset([self.bonus.id]))
+
+    def test_pending_generation_is_not_cached(self):
+        solution = Solution.objects.create(challenge=self.challenge, author=self.user, set=self.sets[0])
+        states = [b.state for b in buttons.get_buttons(self.challenge, self.user)]
+        self.assertEqual(states[0], 'GeneratingButton-0')
+
+        # finished by genworker in another process, without the invalidation
+        Solution.objects.filter(id=solution.id).update(generated=datetime.now())
+        states = [b.state for b in buttons.get_buttons(self.challenge, self.user)]
+        self.assertNotEqual(states[0], 'GeneratingButton-0')
+
+    def test_earned_bonuses_of_any_set(self):
+        self.assertNotContains(self.client.get('/challenge/%d/' % self.challenge.id), 'label-success')
+        self.complete(self.sets[0]).bonuses.add(self.bonus)
+        self.assertContains(self.client.get('/challenge/%d/' % self.challenge.id), 'label-success')
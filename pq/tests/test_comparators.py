@@ -0,0 +1,58 @@
+from StringIO import StringIO
+from django.test import TestCase
+from pq import comparators
+
+
+class Challenge(object):
+    tolerance = 1e-3
+
+    def __init__(self, comparator):
+        self.comparator = comparator
+
+
+class ComparatorTest(TestCase):
+
+    def compare(self, name, output, expected):
+        comparator = comparators.get(Challenge(name))
+        return comparator.compare(StringIO(output), StringIO(expected))
+
+    def test_exact(self):
+        self.assertEqual(self.compare('exact', '1 2\n', '1 2 \n'), None)
+        self.assertEqual(self.compare('exact', '1  2\n', '1 2\n'), 'Your output failed on line 1!')
+
+    def test_token(self):
+        self.assertEqual(self.compare('token', '1  2\n3\n', '1 2\n3'), None)
+        self.assertEqual(self.compare('token', '1 2\n4\n', '1 2\n3'), 'Your output failed on line 2!')
+
+    def test_float(self):
+        self.assertEqual(self.compare('float', '1.0001 2\n3e0', '1 2.0 3'), None)
+        self.assertEqual(self.compare('float', '1 2.1 3', '1 2 3'), 'Your output failed on value 2!')
+        self.assertEqual(self.compare('float', '1 2', '1 2 3'), 'Your output has 2 values, expected 3!')
+        self.assertEqual(self.compare('float', '1 x 3', '1 2 3'),
+            'Your output contains something that is not a number!')
+
+    def test_unordered(self):
+        self.assertEqual(self.compare('unordered', 'b\na\n\na\n', 'a\na\nb\n'), None)
+        self.assertEqual(self.compare('unordered', 'a\nb\n', 'a\na\nb\n'), 'Your output is missing the line "a"!')
+        self.assertEqual(self.compare('unordered', 'a\nc\nb\n', 'a\nb\n'),
+            'Your output has an unexpected line "c"!')
+
+    def test_grid(self):
+        expected = '. # .\n # . #\n. . .\n'
+        self.assertEqual(self.compare('grid', '. # .\n# . #\n. . .', expected), None)
+        self.assertEqual(self.compare('grid', '. # .\n# # #\n. . .', expected),
+            'Your output failed on row 2, column 2!')
+        self.assertEqual(self.compare('grid', '. # .\n# . #\n', expected), 'Your output has 2 rows, expected 3!')
+        self.assertEqual(self.compare('grid', ' a b\nc d e\n', 'a b\nc d\n'),
+            'Your output has 3 cells on row 2, expected 2!')
+        self.assertEqual(self.compare('grid', 'a b\nc d\n', ' a b\nc d e\n'),
+            'Your output has 2 cells on row 2, expected 3!')
+
+    def test_float_blocks(self):
+        old, comparators.BLOCK_SIZE = comparators.BLOCK_SIZE, 2
+        try:
+            self.assertEqual(self.compare('float', '1 2\n3 4\n5', '1 2 3 4 5'), None)
+            self.assertEqual(self.compare('float', '1 2 3 5 5', '1 2 3 4 5'), 'Your output failed on value 4!')
+            self.assertEqual(self.compare('float', '1 2 3', '1 2 3 4 5'), 'Your output has 3 values, expected 5!')
+        finally:
+            comparators.BLOCK_SIZE = old
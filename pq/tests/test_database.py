@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from django.core import signals
+from django.db import DatabaseError, connections
+from django.test import TransactionTestCase
+from pq.models import Challenge, Score
+from pq.scoreboard import get_scoreboard
+from pq import caching, database
+from pq.tests.base import ChallengeMixin
+
+
+class DatabaseTestMixin(object):
+    """
+    Adds SQLite databases in files, next to the in-memory test database.
+    """
+
+    def setUp(self):
+        super(DatabaseTestMixin, self).setUp()
+        self.db_dir = tempfile.mkdtemp()
+        self.aliases = []
+
+    def add_database(self, alias):
+        connections.databases[alias] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(self.db_dir, '%s.sqlite' % alias),
+        }
+        self.aliases.append(alias)
+        return connections[alias]
+
+    def tearDown(self):
+        for alias in self.aliases:
+            connections[alias].close()
+            delattr(connections._connections, alias)
+            del connections.databases[alias]
+        shutil.rmtree(self.db_dir)
+        super(DatabaseTestMixin, self).tearDown()
+
+
+class ConnectionTest(DatabaseTestMixin, TransactionTestCase):
+
+    def test_pragmas(self):
+        old, database.PRAGMAS = database.PRAGMAS, (('journal_mode', 'WAL'), ('synchronous', 'NORMAL'))
+        try:
+            cursor = self.add_database('wal').cursor()
+        finally:
+            database.PRAGMAS = old
+        cursor.execute('PRAGMA journal_mode')
+        self.assertEqual(cursor.fetchone()[0], 'wal')
+        cursor.execute('PRAGMA synchronous')
+        self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_persistent_connections(self):
+        connection = self.add_database('persistent')
+        connection.cursor()
+        database.keep_connections()
+        try:
+            signals.request_finished.send(sender=None)
+            self.assertNotEqual(connection.connection, None)
+        finally:
+            database.close_connections()
+        signals.request_finished.send(sender=None)
+        self.assertEqual(connection.connection, None)
+
+
+class ReplicaTest(DatabaseTestMixin, ChallengeMixin, TransactionTestCase):
+
+    def setUp(self):
+        super(ReplicaTest, self).setUp()
+        self.add_database(database.REPLICA)
+        database.refresh_replica()
+
+    def scoreboard(self):
+        return [row.user_id for row in get_scoreboard(self.challenge)]
+
+    def test_reads_lag_until_refreshed(self):
+        Score.objects.create(challenge=self.challenge, user=self.user, total=50)
+        self.assertEqual(self.scoreboard(), [])
+        self.assertEqual(Score.objects.count(), 1)
+        database.refresh_replica()
+        signals.request_started.send(sender=None)
+        self.assertEqual(self.scoreboard(), [self.user.id])
+
+    def test_replaced_replica_is_reopened(self):
+        connection = connections[database.REPLICA]
+        connection.cursor()
+        signals.request_started.send(sender=None)
+        self.assertNotEqual(connection.connection, None)
+        database.refresh_replica()
+        signals.request_started.send(sender=None)
+        self.assertEqual(connection.connection, None)
+
+    def test_caches_are_filled_from_the_main_database(self):
+        self.assertEqual(caching.get_challenges(1), [self.challenge])
+        challenge = Challenge.objects.create(title='Newer', author=self.user, status=2,
+            started=datetime.now(), preamble='', body='')
+        self.assertFalse(Challenge.objects.using(database.REPLICA).filter(id=challenge.id).exists())
+        self.assertEqual(caching.get_challenges(1), [challenge, self.challenge])
+        self.assertEqual(caching.get_challenge_page(), ([challenge, self.challenge], False))
+
+    def test_unrefreshed_replica_is_not_read(self):
+        Score.objects.create(challenge=self.challenge, user=self.user, total=50)
+        os.remove(connections[database.REPLICA].settings_dict['NAME'])
+        self.assertEqual(self.scoreboard(), [self.user.id])
+        open(connections[database.REPLICA].settings_dict['NAME'], 'w').close()
+        self.assertEqual(self.scoreboard(), [self.user.id])
+
+    def test_writes_go_to_the_main_database(self):
+        Score.objects.create(challenge=self.challenge, user=self.user, total=50)
+        database.refresh_replica()
+        with database.replica():
+            score = Score.objects.get()
+        score.total = 60
+        score.save()
+        self.assertEqual(Score.objects.get().total, 60)
+        self.assertRaises(DatabaseError, connections[database.REPLICA].cursor().execute,
+            'DELETE FROM pq_score')
@@ -0,0 +1,81 @@
+import csv
+import os
+import random
+import tarfile
+from datetime import datetime
+from StringIO import StringIO
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from pq.models import Solution
+from pq import export, scoreboard
+from pq.tests.base import ChallengeTestCase
+
+SOURCE = 'import sys\nfor line in sys.stdin:\n    print(int(line) * 2)\n'
+
+
+class ExportTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(ExportTest, self).setUp()
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'bob')
+        rng = random.Random(1)
+        self.output = ''.join('%d\n' % rng.randint(0, 10 ** 9) for i in range(200000))
+        self.solutions = []
+        for user, set in [(self.user, self.sets[0]), (self.user, self.sets[1]), (self.bob, self.sets[0])]:
+            solution = Solution(challenge=self.challenge, author=user, set=set, status=2,
+                generated=datetime.now(), submitted=datetime.now())
+            solution.source = SimpleUploadedFile('doubling.py', SOURCE)
+            solution.output_user = SimpleUploadedFile('out.txt', self.output)
+            solution.save()
+            self.solutions.append(solution)
+        # started but not completed, nothing uploaded
+        Solution.objects.create(challenge=self.challenge, author=self.bob, set=self.sets[1], status=0)
+        scoreboard.rebuild(self.challenge)
+
+    def open(self, content):
+        return tarfile.open(fileobj=StringIO(content), mode='r:gz')
+
+    def read_csv(self, archive, name):
+        return list(csv.reader(archive.extractfile('challenge-%d/%s' % (self.challenge.id, name))))
+
+    def test_archive(self):
+        chunks = list(export.iter_archive([self.challenge]))
+        # streamed as the output files are read, not built up front
+        self.assertTrue(len(chunks) > 10)
+        self.assertTrue(max(len(chunk) for chunk in chunks) < len(self.output))
+
+        archive = self.open(''.join(chunks))
+        for solution in self.solutions:
+            prefix = 'challenge-%d/' % self.challenge.id
+            self.assertEqual(archive.extractfile(prefix + solution.source.name).read(), SOURCE)
+            self.assertEqual(archive.extractfile(prefix + solution.output_user.name).read(), self.output)
+
+        self.assertEqual(self.read_csv(archive, 'scoreboard.csv'), [
+            ['rank', 'user', 'points', 'bonus_points', 'total'],
+            ['1', 'alice', '150', '0', '150'],
+            ['2', 'bob', '50', '0', '50'],
+        ])
+        rows = self.read_csv(archive, 'solutions.csv')
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[-1][1:5], ['bob', 'Advanced', 'Incomplete', '0'])
+        self.assertEqual(rows[-1][-2:], ['', ''])
+
+    def test_admin_action(self):
+        User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        self.client.login(username='admin', password='admin')
+        response = self.client.post('/admin/pq/challenge/', {
+            'action': 'export_submissions',
+            '_selected_action': [self.challenge.id],
+            'index': 0,
+        }, follow=True)
+        self.assertEqual(response['Content-Type'], 'application/x-gzip')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename=pq-%d.tar.gz' % self.challenge.id)
+        archive = self.open(''.join(response.streaming_content))
+        self.assertEqual(len(archive.getnames()), 8)
+
+    def test_command(self):
+        path = os.path.join(self.media_root, 'export.tar.gz')
+        call_command('export_challenge', str(self.challenge.id), output=path, stdout=open(os.devnull, 'w'))
+        with open(path, 'rb') as f:
+            self.assertEqual(len(self.open(f.read()).getnames()), 8)
@@ -0,0 +1,211 @@
+import json
+import os
+from datetime import timedelta
+from subprocess import CalledProcessError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from pq.models import Solution, PooledInput, PoolStats, GenerationJob, spawn_script
+from pq.workers import WorkerPool
+from pq import blobstore, jobs, pool, scriptworker, seeds
+from pq.tests.base import ChallengeTestCase
+
+
+class PoolTest(ChallengeTestCase):
+
+    def test_fill_and_take(self):
+        set = self.sets[0]
+        self.assertEqual(pool.fill(self.challenge, set, depth=3), 3)
+        self.assertEqual(pool.fill(self.challenge, set, depth=3), 0)
+
+        entry = pool.take(self.challenge, set)
+        self.assertTrue(entry.input_gen)
+        expected = ''.join('%d\n' % (int(l) * 2) for l in entry.input_gen.splitlines())
+        self.assertEqual(entry.output_gen, expected)
+        self.assertEqual(PooledInput.objects.count(), 2)
+
+    def test_generate_falls_back_when_empty(self):
+        solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0])
+        self.assertTrue(pool.generate(solution))
+        self.assertEqual(solution.attempt, 1)
+
+        pool.fill(self.challenge, self.sets[0], depth=1)
+        pooled = PooledInput.objects.get()
+        self.assertEqual(pool.generate(solution), pooled.input_gen)
+        self.assertEqual(solution.attempt, 2)
+
+        stats = PoolStats.objects.get(challenge=self.challenge, set=self.sets[0])
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+        self.assertEqual(stats.hit_rate(), '50%')
+
+
+class WorkerPoolTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(WorkerPoolTest, self).setUp()
+        self.workers = WorkerPool(max_jobs=2)
+
+    def tearDown(self):
+        self.workers.shutdown()
+        super(WorkerPoolTest, self).tearDown()
+
+    def test_run_matches_subprocess(self):
+        path = self.challenge.validator.path
+        self.assertEqual(self.workers.run(path, [], '1\n2\n'), '2\n4\n')
+        self.assertEqual(spawn_script(path, [], '1\n2\n'), '2\n4\n')
+
+    def test_worker_reused_and_recycled(self):
+        path = self.challenge.validator.path
+        self.workers.run(path, [], '1\n')
+        (key, [first]), = self.workers.idle.items()
+        self.workers.run(path, [], '1\n')
+        self.assertFalse(first.alive())
+        self.assertEqual(self.workers.idle[key], [])
+
+    def test_script_change_retires_worker(self):
+        path = self.challenge.validator.path
+        self.workers.run(path, [], '1\n')
+        with open(path, 'w') as f:
+            f.write('import sys\nprint(sys.argv[1])\n')
+        os.utime(path, (0, 0))
+        self.assertEqual(self.workers.run(path, ['x']), 'x\n')
+        self.assertEqual(len(self.workers.idle), 1)
+
+    def test_failing_script_raises(self):
+        path = self.challenge.validator.path
+        self.assertRaises(CalledProcessError, self.workers.run, path, [], 'oops\n')
+
+    def test_json_args(self):
+        # run in this interpreter, whichever python the workers are started with
+        code = compile('import sys\nprint(sys.argv[1])\nprint(u"y")\n', 'args.py', 'exec')
+        self.assertEqual(scriptworker.run(code, 'args.py', [u'x'], ''), (0, None, 'x\ny\n'))
+
+
+class GenerationJobTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(GenerationJobTest, self).setUp()
+        self.client.login(username='alice', password='alice')
+        self.begin_url = '/challenge/%d/begin/%d/' % (self.challenge.id, self.sets[0].id)
+
+    def test_queued_job_is_served_once_done(self):
+        jobs.ASYNC_GENERATION = True
+        try:
+            response = self.client.get(self.begin_url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        finally:
+            jobs.ASYNC_GENERATION = False
+        data = json.loads(response.content)
+        self.assertEqual(data['status'], 'queued')
+        self.assertFalse(Solution.objects.get().generated)
+
+        self.assertEqual(jobs.run_pending(), 1)
+        data = json.loads(self.client.get(data['url']).content)
+        self.assertEqual(data['status'], 'done')
+
+        response = self.client.get(data['download'])
+        self.assertEqual(''.join(response.streaming_content), Solution.objects.get().input_gen)
+        self.assertEqual(GenerationJob.objects.get().status, 2)
+
+    def test_pooled_input_is_done_immediately(self):
+        pool.fill(self.challenge, self.sets[0], depth=1)
+        solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0])
+        job = jobs.enqueue(solution)
+        self.assertEqual(job.status, 2)
+        self.assertEqual(jobs.run_pending(), 0)
+
+    def test_stale_job_is_failed(self):
+        solution = Solution.objects.create(challenge=self.challenge, author=self.user, set=self.sets[0])
+        job = jobs.enqueue(solution)
+        self.assertEqual(jobs.claim(), job)
+        self.assertEqual(jobs.enqueue(solution), job)
+
+        # the worker died while running it
+        GenerationJob.objects.filter(id=job.id).update(started=jobs.stale_before() - timedelta(seconds=1))
+        retry = jobs.enqueue(solution)
+        self.assertNotEqual(retry, job)
+        self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(GenerationJob.objects.get(id=job.id).status, 3)
+        self.assertEqual(GenerationJob.objects.get(id=retry.id).status, 2)
+
+    def test_sync_download(self):
+        response = self.client.get(self.begin_url)
+        self.assertEqual(''.join(response.streaming_content), Solution.objects.get().input_gen)
+
+
+SEEDED_GENERATOR = """
+import random, sys
+random.seed(int(sys.argv[2]))
+for i in range(int(sys.argv[1]) * 5):
+    print(random.randint(0, 1000))
+"""
+
+
+class SeededGenerationTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(SeededGenerationTest, self).setUp()
+        with open(self.challenge.generator.path, 'w') as f:
+            f.write(SEEDED_GENERATOR)
+        self.challenge.seeded_generator = True
+        self.challenge.comparator = 'token'
+        self.challenge.save()
+        self.solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0])
+        self.input_gen = self.solution.generate()
+        self.solution.save()
+
+    def reload(self):
+        seeds.cache.clear()
+        return Solution.objects.get(id=self.solution.id)
+
+    def test_only_the_seed_is_stored(self):
+        self.assertTrue(self.solution.seed is not None)
+        self.assertEqual(self.solution.input_size, len(self.input_gen))
+        self.assertFalse(blobstore.exists(self.solution.input_digest))
+        self.assertFalse(blobstore.exists(self.solution.output_digest))
+
+    def test_regenerated_on_demand(self):
+        solution = self.reload()
+        self.assertEqual(solution.input_gen, self.input_gen)
+        with solution.open_output() as f:
+            self.assertEqual(f.read(), ''.join('%d\n' % (int(l) * 2) for l in self.input_gen.splitlines()))
+
+    def test_retry_gets_a_new_seed(self):
+        seed = self.solution.seed
+        self.solution.generate()
+        self.assertNotEqual(self.solution.seed, seed)
+        self.assertEqual(self.solution.attempt, 2)
+
+    def test_pool_is_skipped(self):
+        self.assertEqual(pool.fill_all(depth=2), 0)
+        self.assertEqual(pool.take(self.challenge, self.sets[0]), None)
+
+    def test_mismatch_is_detected(self):
+        with open(self.challenge.generator.path, 'w') as f:
+            f.write('print(1)\n')
+        os.utime(self.challenge.generator.path, (0, 0))
+        solution = self.reload()
+        self.assertRaises(seeds.SeedMismatch, lambda: solution.input_gen)
+
+    def test_download_and_upload(self):
+        self.client.login(username='alice', password='alice')
+        seeds.cache.clear()
+        response = self.client.get('/challenge/%d/s-%d/input/' % (self.challenge.id, self.solution.id))
+        self.assertEqual(''.join(response.streaming_content), self.input_gen)
+
+        seeds.cache.clear()
+        output = ''.join('%d\n' % (int(l) * 2) for l in self.input_gen.splitlines())
+        self.client.post('/challenge/%d/%d/upload/' % (self.challenge.id, self.solution.id),
+            {'output_user': SimpleUploadedFile('out.txt', output, 'text/plain'), 'solution': self.solution.id})
+        self.assertEqual(Solution.objects.get(id=self.solution.id).status, 2)
+
+
+class LRUCacheTest(TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = seeds.LRUCache(10)
+        cache.set('a', 'a', 4)
+        cache.set('b', 'b', 4)
+        cache.get('a')
+        cache.set('c', 'c', 4)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), ('a', None, 'c'))
+        cache.set('d', 'd', 11)
+        self.assertEqual(cache.get('d'), None)
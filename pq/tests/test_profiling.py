@@ -0,0 +1,78 @@
+import json
+import logging
+from pq.models import SlowRequest, Solution
+from pq import profiling
+from pq.tests.base import ChallengeTestCase
+
+
+class RecordingHandler(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(json.loads(record.getMessage()))
+
+
+class ProfilingTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(ProfilingTest, self).setUp()
+        self.handler = RecordingHandler()
+        profiling.logger.addHandler(self.handler)
+        self.client.login(username='alice', password='alice')
+
+    def tearDown(self):
+        profiling.logger.removeHandler(self.handler)
+        super(ProfilingTest, self).tearDown()
+
+    def timing(self, response):
+        timing = {}
+        for part in response['Server-Timing'].split(', '):
+            fields = part.split(';')
+            timing[fields[0]] = dict(f.split('=') for f in fields[1:])
+        return timing
+
+    def test_challenge_page(self):
+        response = self.client.get('/challenge/%d/' % self.challenge.id)
+        timing = self.timing(response)
+        self.assertTrue(int(timing['db']['desc'].strip('"')) > 0)
+        self.assertEqual(timing['render']['desc'], '"1"')
+        self.assertEqual(timing['script']['desc'], '"0"')
+
+        record = self.handler.records[-1]
+        self.assertEqual(record['view'], 'pq.views.challenge')
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['render_count'], 1)
+
+    def test_script_time_is_counted(self):
+        response = self.client.get('/challenge/%d/begin/%d/' % (self.challenge.id, self.sets[0].id))
+        self.assertEqual(self.timing(response)['script']['desc'], '"2"')
+        self.assertEqual(self.handler.records[-1]['script_count'], 2)
+
+    def test_connections_are_restored(self):
+        self.client.get('/')
+        with self.assertNumQueries(1):
+            Solution.objects.count()
+
+    def test_slow_requests_are_kept(self):
+        slow_ms, profiling.SLOW_MS = profiling.SLOW_MS, 0
+        try:
+            self.client.get('/challenge/%d/' % self.challenge.id)
+        finally:
+            profiling.SLOW_MS = slow_ms
+        slow = SlowRequest.objects.get()
+        self.assertEqual((slow.view, slow.status), ('pq.views.challenge', 200))
+        self.assertTrue(slow.db_queries > 0)
+
+    def test_only_the_slowest_are_kept(self):
+        keep, profiling.SLOW_KEEP = profiling.SLOW_KEEP, 2
+        try:
+            for total in (600, 900, 700, 500, 800):
+                profiling.save_slow_request({'method': 'GET', 'path': '/', 'view': None, 'status': 200,
+                    'total_ms': total, 'db_ms': 0, 'db_count': 0, 'script_ms': 0, 'script_count': 0,
+                    'render_ms': 0})
+        finally:
+            profiling.SLOW_KEEP = keep
+        self.assertEqual(sorted(SlowRequest.objects.values_list('total', flat=True)), [800, 900])
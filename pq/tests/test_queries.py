@@ -0,0 +1,135 @@
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.signals import request_started
+from django.db import connection, reset_queries
+from django.db.models import Min
+from django.test import TransactionTestCase
+from django.test.utils import override_settings
+from pq.models import Score, Solution
+from pq.scoreboard import rebuild
+from pq.tests.base import ChallengeMixin, ChallengeTestCase
+
+SIZES = [10, 100, 1000]
+
+# the most queries each view may make, whatever the number of participants
+BUDGETS = {
+    'challenge': 8,
+    'solution': 8,
+    'challenge_list': 5,
+    'solution_upload': 19,
+}
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryBudgetTest(ChallengeTestCase):
+    """
+    Query counts of the busiest views must not grow with the number of
+    participants.
+    """
+
+    def setUp(self):
+        super(QueryBudgetTest, self).setUp()
+        self.challenge.source_req = True
+        self.challenge.save()
+        self.password = make_password('secret')
+        self.participants = 0
+        os.makedirs(os.path.join(self.media_root, 'source'))
+        with open(os.path.join(self.media_root, 'source', 'p.py'), 'w') as f:
+            f.write('print 1\n')
+
+    def grow(self, n):
+        """
+        Add participants up to n, each with a completed first set.
+        """
+        first = self.participants
+        User.objects.bulk_create([User(username='p%d' % i, password=self.password)
+            for i in range(first, n)])
+        users = User.objects.filter(username__in=['p%d' % i for i in range(first, n)])
+        Solution.objects.bulk_create([Solution(challenge=self.challenge, author=user, set=self.sets[0],
+            status=2, submitted=datetime.now(), source='source/p.py') for user in users])
+        rebuild(self.challenge)
+        self.participants = n
+
+    @contextmanager
+    def assertMaxQueries(self, view):
+        old_debug_cursor = connection.use_debug_cursor
+        connection.use_debug_cursor = True
+        request_started.disconnect(reset_queries)
+        start = len(connection.queries)
+        try:
+            yield
+        finally:
+            connection.use_debug_cursor = old_debug_cursor
+            request_started.connect(reset_queries)
+        queries = connection.queries[start:]
+        self.assertTrue(len(queries) <= BUDGETS[view], '%s made %d queries with %d participants:\n%s' % (
+            view, len(queries), self.participants, '\n'.join(q['sql'] for q in queries)))
+
+    def login(self, username):
+        User.objects.create(username=username, password=self.password)
+        self.client.login(username=username, password='secret')
+
+    def test_challenge(self):
+        self.login('visitor')
+        for n in SIZES:
+            self.grow(n)
+            with self.assertMaxQueries('challenge'):
+                self.client.get('/challenge/%d/' % self.challenge.id)
+
+    def test_solution(self):
+        self.login('visitor')
+        for n in SIZES:
+            self.grow(n)
+            solution = Solution.objects.filter(challenge=self.challenge).latest('id')
+            with self.assertMaxQueries('solution'):
+                self.client.get('/challenge/%d/s-%d/' % (self.challenge.id, solution.id))
+
+    def test_challenge_list(self):
+        self.login('visitor')
+        for n in SIZES:
+            self.grow(n)
+            with self.assertMaxQueries('challenge_list'):
+                self.client.get('/challenge/')
+
+    def test_solution_upload(self):
+        for n in SIZES:
+            self.grow(n)
+            self.login('uploader%d' % n)
+            response = self.client.get('/challenge/%d/begin/%d/' % (self.challenge.id, self.sets[0].id))
+            output = ''.join('%d\n' % (int(line) * 2) for line in ''.join(response.streaming_content).split())
+            solution = Solution.objects.get(challenge=self.challenge, author__username='uploader%d' % n)
+            with self.assertMaxQueries('solution_upload'):
+                self.client.post('/challenge/%d/%d/upload/' % (self.challenge.id, solution.id), {
+                    'solution': solution.id,
+                    'output_user': SimpleUploadedFile('out.txt', output),
+                    'source': SimpleUploadedFile('doubling.py', 'print 1\n'),
+                })
+            self.assertEqual(Solution.objects.get(id=solution.id).status, 2)
+            self.assertEqual(Score.objects.get(challenge=self.challenge, user=solution.author).total, 50)
+
+
+class SolutionIndexTest(ChallengeMixin, TransactionTestCase):
+    """
+    The hot Solution queries are answered from an index alone. (EXPLAIN
+    commits the test transaction, hence TransactionTestCase.)
+    """
+
+    def assertCoveringIndex(self, qs):
+        sql, params = qs.query.sql_with_params()
+        cursor = connection.cursor()
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertTrue('COVERING INDEX' in plan, plan)
+
+    def test_indexes(self):
+        users = [User.objects.create(username='p%d' % i) for i in range(10)]
+        Solution.objects.bulk_create([Solution(challenge=self.challenge, author=user, set=self.sets[0],
+            status=2, submitted=datetime.now()) for user in users])
+        completed = self.challenge.solution_set.filter(status=2)
+        self.assertCoveringIndex(completed.values('set').annotate(Min('submitted')))
+        self.assertCoveringIndex(completed.filter(set=self.sets[0]).values('id'))
+        self.assertCoveringIndex(self.challenge.solution_set.filter(set=self.sets[0]).values('status'))
@@ -0,0 +1,63 @@
+import os
+import tempfile
+from subprocess import CalledProcessError
+from pq.models import ScriptStats, run_script
+from pq.sandbox import ScriptTimeout
+from pq.workers import WorkerPool
+from pq import sandbox
+from pq.tests.base import ChallengeTestCase
+
+
+class SandboxTest(ChallengeTestCase):
+
+    def script(self, code):
+        fd, path = tempfile.mkstemp(suffix='.py', dir=self.media_root)
+        with os.fdopen(fd, 'w') as f:
+            f.write(code)
+        return path
+
+    def test_result(self):
+        result = sandbox.execute(self.challenge.validator.path, [], '1\n2\n')
+        self.assertEqual((result.status, result.output), (0, '2\n4\n'))
+        self.assertTrue(result.elapsed > 0)
+        self.assertTrue(result.peak_rss > 0)
+
+    def test_exit_status(self):
+        result = sandbox.execute(self.script('import sys\nsys.exit(3)\n'))
+        self.assertEqual(result.status, 3)
+        self.assertRaises(CalledProcessError, result.check)
+
+    def test_timeout(self):
+        result = sandbox.execute(self.script('while True: pass\n'), timeout=1)
+        self.assertTrue(result.timed_out)
+        self.assertRaises(ScriptTimeout, result.check)
+
+    def test_memory_limit(self):
+        result = sandbox.execute(self.script('x = " " * (4 * 1024 ** 3)\n'))
+        self.assertNotEqual(result.status, 0)
+
+    def test_output_limit(self):
+        result = sandbox.execute(self.script('while True: print("x" * 1000)\n'), max_output=10000)
+        self.assertNotEqual(result.status, 0)
+        self.assertTrue(len(result.output) <= 10000)
+
+    def test_worker_timeout(self):
+        workers = WorkerPool()
+        try:
+            path = self.script('import sys\nif sys.argv[1] == "loop":\n    while True: pass\nprint("ok")\n')
+            key, worker = workers.acquire(path)
+            result = worker.call(['loop'], timeout=1)
+            self.assertTrue(result.timed_out)
+            self.assertFalse(worker.alive())
+            self.assertEqual(workers.run(path, ['once']), 'ok\n')
+        finally:
+            workers.shutdown()
+
+    def test_run_script_records_stats(self):
+        path = self.challenge.validator.path
+        run_script(path, [], '1\n')
+        self.assertRaises(CalledProcessError, run_script, path, [], 'oops\n')
+        stats = ScriptStats.objects.get()
+        self.assertEqual(stats.path, os.path.relpath(path, self.media_root))
+        self.assertEqual((stats.runs, stats.failures, stats.timeouts), (2, 1, 0))
+        self.assertTrue(stats.max_elapsed > 0 and stats.max_rss > 0)
@@ -0,0 +1,88 @@
+import os
+from datetime import datetime
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from pq.models import Bonus, Ranking, Score, Solution
+from pq import scoreboard
+from pq.tests.base import ChallengeTestCase
+
+
+class ScoreTestCase(ChallengeTestCase):
+
+    def setUp(self):
+        super(ScoreTestCase, self).setUp()
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'bob')
+        self.bonus = Bonus.objects.create(title='Speedy', description='', icon='', points=7)
+
+    def complete(self, user, set, bonus=False):
+        solution = Solution.objects.create(challenge=self.challenge, author=user, set=set,
+            status=2, submitted=datetime.now())
+        if bonus:
+            solution.bonuses.add(self.bonus)
+        scoreboard.update_score(self.challenge, user)
+        return solution
+
+
+class ScoreboardTest(ScoreTestCase):
+
+    def test_update_score(self):
+        basic = self.complete(self.user, self.sets[0])
+        advanced = self.complete(self.user, self.sets[1], bonus=True)
+        self.complete(self.bob, self.sets[0])
+
+        rows = list(scoreboard.get_scoreboard(self.challenge))
+        self.assertEqual([(r.user, r.points, r.bonus_points, r.total) for r in rows],
+            [(self.user, 150, 7, 157), (self.bob, 50, 0, 50)])
+        self.assertEqual(rows[0].solution_links(),
+            [{'id': basic.id, 'label': 'bas'}, {'id': advanced.id, 'label': 'adv'}])
+
+    def test_rebuild_matches_incremental(self):
+        self.complete(self.user, self.sets[0], bonus=True)
+        self.complete(self.bob, self.sets[0])
+        self.complete(self.bob, self.sets[1])
+        before = [(r.user_id, r.total, r.solutions) for r in scoreboard.get_scoreboard(self.challenge)]
+
+        Score.objects.all().delete()
+        call_command('rebuild_scoreboard', stdout=open(os.devnull, 'w'))
+        after = [(r.user_id, r.total, r.solutions) for r in scoreboard.get_scoreboard(self.challenge)]
+        self.assertEqual(before, after)
+
+    def test_scoreboard_is_one_query(self):
+        self.complete(self.user, self.sets[0])
+        self.complete(self.bob, self.sets[0])
+        with self.assertNumQueries(1):
+            [(r.user.username, r.solution_links()) for r in scoreboard.get_scoreboard(self.challenge)]
+
+    def test_challenge_page(self):
+        solution = self.complete(self.user, self.sets[0])
+        response = self.client.get('/challenge/%d/' % self.challenge.id)
+        self.assertContains(response, '/challenge/%d/s-%d/' % (self.challenge.id, solution.id))
+
+
+class LeaderboardTest(ScoreTestCase):
+
+    def test_rankings_follow_scores(self):
+        self.complete(self.user, self.sets[0])
+        self.complete(self.bob, self.sets[0])
+        carol = User.objects.create_user('carol', 'carol@example.com', 'carol')
+        self.complete(carol, self.sets[0])
+        self.complete(carol, self.sets[1])
+
+        rankings = scoreboard.get_leaderboard()
+        self.assertEqual([(r.user, r.rank, r.total) for r in rankings],
+            [(carol, 1, 150), (self.user, 2, 50), (self.bob, 2, 50)])
+        self.assertEqual([r.rank for r in scoreboard.get_leaderboard(2, 5)], [2])
+        self.assertEqual(scoreboard.get_rank(Ranking.objects.get(user=self.bob)), 2)
+
+    def test_rebuild_rankings(self):
+        self.complete(self.user, self.sets[0], bonus=True)
+        Ranking.objects.all().delete()
+        self.assertEqual(scoreboard.rebuild_rankings(), 1)
+        self.assertEqual(Ranking.objects.get(user=self.user).total, 57)
+
+    def test_profile_and_leaderboard_pages(self):
+        solution = self.complete(self.user, self.sets[0])
+        response = self.client.get('/users/alice/')
+        self.assertContains(response, 'Rank 1st')
+        self.assertContains(response, '/challenge/%d/s-%d/' % (self.challenge.id, solution.id))
+        self.assertContains(self.client.get('/leaderboard/'), '/users/alice/')
@@ -0,0 +1,229 @@
+import gzip
+import os
+from StringIO import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.client import Client
+from django.utils.http import urlunquote
+from pq.models import Language, Solution
+from pq import blobstore, highlight, samplescripts, serving
+from pq.tests.base import ChallengeTestCase
+
+SOURCE = 'import sys\nfor line in sys.stdin:\n    print(int(line) * 2)\n' * 20
+
+
+class SourceServingTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(SourceServingTest, self).setUp()
+        self.solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0], status=2)
+        self.solution.source = SimpleUploadedFile('doubling.py', SOURCE)
+        self.solution.save()
+        self.url = '/challenge/%d/s-%d/raw/' % (self.challenge.id, self.solution.id)
+
+    def content(self, response):
+        return ''.join(response.streaming_content)
+
+    def test_source_is_hashed_and_compressed(self):
+        self.assertEqual(len(self.solution.source_digest), 40)
+        with gzip.open(self.solution.source.path + '.gz') as f:
+            self.assertEqual(f.read(), SOURCE)
+
+    def test_conditional_get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(self.content(response), SOURCE)
+        self.assertEqual(response['ETag'], '"%s"' % self.solution.source_digest)
+        self.assertEqual(response['Content-Length'], str(len(SOURCE)))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_gzip_variant(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.GzipFile(fileobj=StringIO(self.content(response))).read(), SOURCE)
+        self.assertTrue(int(response['Content-Length']) < len(SOURCE))
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=7-16')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.content(response), SOURCE[7:17])
+        self.assertEqual(response['Content-Range'], 'bytes 7-16/%d' % len(SOURCE))
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(self.content(response), SOURCE[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=%d-' % (len(SOURCE) + 10))
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */%d' % len(SOURCE))
+
+        # several ranges, other units and malformed ranges get the whole file
+        for header in ('bytes=0-1,5-6', 'lines=1-2', 'bytes=9-3', 'bytes=x'):
+            response = self.client.get(self.url, HTTP_RANGE=header)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.content(response), SOURCE)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_download(self):
+        response = self.client.get('/challenge/%d/s-%d/download/' % (self.challenge.id, self.solution.id))
+        self.assertEqual(response['Content-Disposition'],
+            'attachment; filename=%s' % os.path.basename(self.solution.source.name))
+
+    def test_older_sources_are_hashed_on_demand(self):
+        os.remove(self.solution.source.path + '.gz')
+        Solution.objects.filter(id=self.solution.id).update(source_digest='')
+        response = self.client.get(self.url)
+        self.assertEqual(response['ETag'], '"%s"' % self.solution.source_digest)
+        self.assertEqual(Solution.objects.get(id=self.solution.id).source_digest, self.solution.source_digest)
+        self.assertTrue(os.path.exists(self.solution.source.path + '.gz'))
+
+
+class HighlightTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(HighlightTest, self).setUp()
+        self.challenge.source_req = True
+        self.challenge.save()
+        self.solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0], status=2)
+        self.solution.source = SimpleUploadedFile('doubling.py', SOURCE)
+        self.solution.save()
+
+    def test_highlighted_on_upload(self):
+        key = highlight.HTML_KEY % (self.solution.source_digest, 'py')
+        self.assertTrue('<span class="kn">import</span>' in cache.get(key))
+
+    def test_page_uses_cached_html(self):
+        def fail(source, extension):
+            raise AssertionError('highlighted again')
+        original, highlight.highlight = highlight.highlight, fail
+        try:
+            response = self.client.get('/challenge/%d/s-%d/' % (self.challenge.id, self.solution.id))
+        finally:
+            highlight.highlight = original
+        self.assertContains(response, '<div class="highlight">')
+        self.assertNotContains(response, 'prettyprint')
+
+    def test_lexer_from_language(self):
+        self.solution.language = Language.objects.create(name='Plain', extension='txt')
+        self.assertFalse('<span class="kn">' in highlight.solution_html(self.solution))
+
+
+class ProxyClient(Client):
+    """
+    Stands in for the front proxy: X-Sendfile and X-Accel-Redirect responses
+    get the content of the file they point to.
+    """
+    def request(self, **request):
+        response = super(ProxyClient, self).request(**request)
+        if response.has_header('X-Sendfile'):
+            path = response['X-Sendfile']
+        elif response.has_header('X-Accel-Redirect'):
+            url = urlunquote(response['X-Accel-Redirect'])
+            for root, prefix in serving.SENDFILE_ROOTS:
+                if url.startswith(prefix):
+                    path = os.path.join(root, url[len(prefix):])
+                    break
+            else:
+                raise AssertionError('no internal location for %s' % url)
+        else:
+            return response
+        assert not response.content, 'the proxy would drop the response body'
+        with open(path, 'rb') as f:
+            response.content = f.read()
+        response.sent_file = path
+        return response
+
+
+class OffloadedServingTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(OffloadedServingTest, self).setUp()
+        self.client = ProxyClient()
+        self.client.login(username='alice', password='alice')
+        self.solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0], status=2)
+        self.solution.source = SimpleUploadedFile('doubling.py', SOURCE)
+        self.solution.save()
+        self.raw_url = '/challenge/%d/s-%d/raw/' % (self.challenge.id, self.solution.id)
+        self.begin_url = '/challenge/%d/begin/%d/' % (self.challenge.id, self.sets[1].id)
+        self.old = serving.SENDFILE, serving.SENDFILE_ROOTS
+        serving.SENDFILE_ROOTS = (
+            (blobstore.root(), '/protected/blobs/'),
+            (self.media_root, '/protected/media/'),
+        )
+
+    def tearDown(self):
+        serving.SENDFILE, serving.SENDFILE_ROOTS = self.old
+        super(OffloadedServingTest, self).tearDown()
+
+    def input_gen(self):
+        return Solution.objects.get(set=self.sets[1]).input_gen
+
+    def test_fallback_sends_stored_gzip(self):
+        response = self.client.get(self.begin_url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        content = ''.join(response.streaming_content)
+        self.assertEqual(gzip.GzipFile(fileobj=StringIO(content)).read(), self.input_gen())
+        self.assertEqual(response['Content-Length'], str(len(content)))
+
+        response = self.client.get(self.begin_url)
+        self.assertEqual(''.join(response.streaming_content), self.input_gen())
+
+    def test_accel_redirect(self):
+        serving.SENDFILE = 'x-accel-redirect'
+        response = self.client.get(self.raw_url)
+        self.assertTrue(response['X-Accel-Redirect'].startswith('/protected/media/'))
+        self.assertEqual(response.content, SOURCE)
+        self.assertEqual(response['ETag'], '"%s"' % self.solution.source_digest)
+        self.assertEqual(self.client.get(self.raw_url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        response = self.client.get(self.begin_url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['X-Accel-Redirect'].startswith('/protected/blobs/'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.GzipFile(fileobj=StringIO(response.content)).read(), self.input_gen())
+
+    def test_sendfile(self):
+        serving.SENDFILE = 'x-sendfile'
+        response = self.client.get(self.begin_url, HTTP_ACCEPT_ENCODING='gzip')
+        digest = Solution.objects.get(set=self.sets[1]).input_digest
+        self.assertEqual(response.sent_file, os.path.abspath(blobstore.path(digest)))
+        self.assertEqual(gzip.GzipFile(fileobj=StringIO(response.content)).read(), self.input_gen())
+
+    def test_unmapped_files_are_streamed(self):
+        serving.SENDFILE = 'x-accel-redirect'
+        serving.SENDFILE_ROOTS = ()
+        response = self.client.get(self.raw_url)
+        self.assertFalse(response.has_header('X-Accel-Redirect'))
+        self.assertEqual(''.join(response.streaming_content), SOURCE)
+
+    def test_media(self):
+        url = '/media/%s' % self.solution.source.name
+        response = self.client.get(url)
+        self.assertEqual(''.join(response.streaming_content), SOURCE)
+        self.assertEqual(response['Content-Type'], 'text/x-python')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        serving.SENDFILE = 'x-accel-redirect'
+        self.assertEqual(self.client.get(url).content, SOURCE)
+
+        self.assertEqual(self.client.get('/media/nothing.txt').status_code, 404)
+        self.assertEqual(self.client.get('/media/../../etc/passwd').status_code, 404)
+        self.assertEqual(self.client.get('/media/%s' % os.path.dirname(self.solution.source.name)).status_code, 404)
+
+    def test_private_media(self):
+        url = '/media/%s' % self.challenge.validator.name
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.login(username='alice', password='alice')
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        User.objects.filter(username='alice').update(is_staff=True)
+        response = self.client.get(url)
+        self.assertEqual(''.join(response.streaming_content), samplescripts.VALIDATOR)
+        self.assertTrue('private' in response['Cache-Control'])
+        self.assertFalse('public' in response['Cache-Control'])
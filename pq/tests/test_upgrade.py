@@ -0,0 +1,23 @@
+import os
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from pq.models import Bonus
+
+
+class AddColumnsTest(TransactionTestCase):
+
+    def test_missing_columns_get_defaults(self):
+        Bonus.objects.create(title='Fast', description='', icon='', points=5)
+
+        # the bonus table as it was before bonus rules
+        cursor = connection.cursor()
+        cursor.execute('CREATE TABLE pq_bonus_old (id integer NOT NULL PRIMARY KEY, title varchar(100) NOT NULL, '
+            'description text NOT NULL, icon varchar(100) NOT NULL, points integer NOT NULL)')
+        cursor.execute('INSERT INTO pq_bonus_old SELECT id, title, description, icon, points FROM pq_bonus')
+        cursor.execute('DROP TABLE pq_bonus')
+        cursor.execute('ALTER TABLE pq_bonus_old RENAME TO pq_bonus')
+
+        call_command('addcolumns', stdout=open(os.devnull, 'w'))
+        bonus = Bonus.objects.get()
+        self.assertEqual((bonus.title, bonus.rule, bonus.params), ('Fast', 'manual', ''))
@@ -0,0 +1,86 @@
+from StringIO import StringIO
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from pq import verify
+from pq.forms import SolutionForm
+from pq.models import Score, Solution
+from pq.tests.base import ChallengeTestCase
+
+
+class VerifyTest(TestCase):
+
+    def check(self, output, expected, chunk_size=3):
+        return verify.verify(StringIO(output), StringIO(expected), chunk_size)
+
+    def test_lines_are_split_across_chunks(self):
+        self.assertEqual(list(verify.iter_lines(['12\n3', '4\n', '56'])), ['12', '34', '56'])
+
+    def test_whitespace_and_trailing_lines_are_ignored(self):
+        self.assertEqual(self.check('1 \r\n2\n\n', '1\n 2'), None)
+
+    def test_first_failing_line(self):
+        self.assertEqual(self.check('10\n20\n31\n40\n', '10\n20\n30\n40\n'), 3)
+        self.assertEqual(self.check('10\n', '10\n20\n'), 2)
+        self.assertEqual(self.check('10\n20\n', '10\n'), 2)
+
+
+class SolutionFormTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(SolutionFormTest, self).setUp()
+        self.solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0])
+        self.solution.generate()
+
+    def form(self, output):
+        files = {'output_user': SimpleUploadedFile('out.txt', output, 'text/plain')}
+        return SolutionForm({}, files, instance=self.solution)
+
+    def test_correct_output(self):
+        form = self.form(self.solution.output_gen)
+        self.assertTrue(form.is_valid())
+
+    def test_wrong_output(self):
+        form = self.form('-1\n')
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.non_field_errors(), ['Your output failed on line 1!'])
+
+    def test_digest_match_skips_diff(self):
+        form = self.form('anything\n')
+        form.output_digest = self.solution.output_check
+        self.assertTrue(form.is_valid())
+
+    def test_normalized_output_matches_digest(self):
+        output = self.solution.output_gen.replace('\n', ' \r\n') + '\n\n'
+        self.assertEqual(verify.line_digest([output[:7], output[7:]]), self.solution.output_check)
+
+
+class SolutionUploadTest(ChallengeTestCase):
+
+    def setUp(self):
+        super(SolutionUploadTest, self).setUp()
+        self.client.login(username='alice', password='alice')
+        self.solution = Solution(challenge=self.challenge, author=self.user, set=self.sets[0])
+        self.solution.generate()
+        self.solution.save()
+        self.url = '/challenge/%d/%d/upload/' % (self.challenge.id, self.solution.id)
+
+    def upload(self, output):
+        output_user = SimpleUploadedFile('out.txt', output, 'text/plain')
+        self.client.post(self.url, {'output_user': output_user, 'solution': self.solution.id})
+        return Solution.objects.get(id=self.solution.id)
+
+    def test_correct_upload_completes_solution(self):
+        self.assertEqual(self.upload(self.solution.output_gen).status, 2)
+        self.assertEqual(Score.objects.get(challenge=self.challenge, user=self.user).total, 50)
+
+    def test_wrong_upload(self):
+        self.assertEqual(self.upload('-1\n').status, 0)
+
+    def test_only_the_author_can_upload(self):
+        User.objects.create_user('bob', 'bob@example.com', 'bob')
+        self.client.login(username='bob', password='bob')
+        output_user = SimpleUploadedFile('out.txt', self.solution.output_gen, 'text/plain')
+        response = self.client.post(self.url, {'output_user': output_user, 'solution': self.solution.id})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Solution.objects.get(id=self.solution.id).status, 0)
@@ -0,0 +1,30 @@
+"""
+Upload handlers.
+"""
+from django.core.files.uploadhandler import FileUploadHandler
+from pq import verify
+
+
+class OutputDigestUploadHandler(FileUploadHandler):
+    """
+    Computes the normalized digest of an uploaded output while it is being
+    received, and leaves it in request.output_digests keyed by field name.
+    The data is passed on untouched to the next handler.
+    """
+    field_names = ['output_user']
+
+    def new_file(self, field_name, *args, **kwargs):
+        super(OutputDigestUploadHandler, self).new_file(field_name, *args, **kwargs)
+        self.digest = verify.LineDigest() if field_name in self.field_names else None
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.digest:
+            self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.digest:
+            if not hasattr(self.request, 'output_digests'):
+                self.request.output_digests = {}
+            self.request.output_digests[self.field_name] = self.digest.hexdigest()
+        return None
@@ -0,0 +1,122 @@
+"""
+Output verification.
+
+Both the uploaded output and the expected output are read in fixed size
+chunks, so checking an output takes the same memory no matter how large it is.
+Lines are compared with surrounding whitespace stripped, and missing lines
+count as empty ones.
+"""
+import hashlib
+import re
+from itertools import izip_longest
+
+CHUNK_SIZE = 64 * 1024
+
+# whitespace that normalization would strip next to a line break, or a blank line
+UNNORMALIZED = re.compile(r'[ \t\r\x0b\x0c]\n|\n[ \t\r\x0b\x0c\n]')
+WHITESPACE = ' \t\r\x0b\x0c\n'
+
+
+def iter_chunks(f, chunk_size=CHUNK_SIZE):
+    """
+    Yield the content of a file object in fixed size chunks.
+    """
+    if hasattr(f, 'chunks'):
+        # django files know how to rewind and read themselves
+        for chunk in f.chunks(chunk_size):
+            yield chunk
+        return
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def iter_lines(chunks):
+    """
+    Split a stream of chunks into lines, without their line endings.
+    """
+    tail = ''
+    for chunk in chunks:
+        lines = (tail + chunk).split('\n')
+        tail = lines.pop()
+        for line in lines:
+            yield line
+    if tail:
+        yield tail
+
+
+def first_mismatch(output, expected):
+    """
+    Compare two streams of lines. Returns the number of the first line that
+    differs, or None if they match.
+    """
+    for i, (a, b) in enumerate(izip_longest(output, expected, fillvalue='')):
+        if a.strip() != b.strip():
+            return i + 1
+    return None
+
+
+def verify(output_file, expected_file, chunk_size=CHUNK_SIZE):
+    """
+    Check an output file against the expected output file.
+    """
+    return first_mismatch(iter_lines(iter_chunks(output_file, chunk_size)),
+                          iter_lines(iter_chunks(expected_file, chunk_size)))
+
+
+class LineDigest(object):
+    """
+    Incremental sha1 of a stream with the same normalization as the line by
+    line comparison: every line stripped, trailing blank lines dropped. Two
+    streams with equal digests always pass verification.
+    """
+    def __init__(self):
+        self.sha = hashlib.sha1()
+        self.tail = ''
+        self.blank = 0
+
+    def update(self, chunk):
+        text = self.tail + chunk
+        end = text.rfind('\n') + 1
+        body, self.tail = text[:end], text[end:]
+        if not body:
+            return
+        if body[0] not in WHITESPACE and not UNNORMALIZED.search(body):
+            # already normalized, hash the whole block in one go
+            self._flush_blank()
+            self.sha.update(body)
+        else:
+            for line in body[:-1].split('\n'):
+                self._line(line)
+
+    def _line(self, line):
+        line = line.strip()
+        if not line:
+            # blank lines only count if something follows them
+            self.blank += 1
+            return
+        self._flush_blank()
+        self.sha.update(line + '\n')
+
+    def _flush_blank(self):
+        if self.blank:
+            self.sha.update('\n' * self.blank)
+            self.blank = 0
+
+    def hexdigest(self):
+        digest = LineDigest()
+        digest.sha, digest.blank = self.sha.copy(), self.blank
+        digest._line(self.tail)
+        return digest.sha.hexdigest()
+
+
+def line_digest(chunks):
+    """
+    Normalized digest of a stream of chunks.
+    """
+    digest = LineDigest()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
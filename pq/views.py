@@ -1,19 +1,31 @@
 import os
-import itertools
+import json
+import mimetypes
 from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
-from django.db.models import Sum, Max
-from django.http import HttpResponse, HttpResponseRedirect
+from django.db import transaction
+from django.db.models import Sum, Max, Count
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse, Http404
 from django.shortcuts import render_to_response, get_object_or_404
 from django.template import RequestContext
+from django.template.loader import render_to_string
 from django.utils import timezone
-from pq.models import Challenge, Solution, Bonus, Set
+from django.utils._os import safe_join
+from pq.models import Challenge, Solution, Bonus, Set, GenerationJob, Score, Ranking
 from pq.forms import SolutionForm        
-from pq import buttons
+from pq.signals import solution_completed
+from pq.scoreboard import get_scoreboard, get_leaderboard, get_rank, update_score
+from pq import blobstore, bonuses, buttons, caching, database, highlight, jobs, pool, serving
+
+LEADERBOARD_PAGE = 50
+CHALLENGE_PAGE = 20
+# directories under MEDIA_ROOT anyone may download from, the rest is staff only
+PUBLIC_MEDIA = ('source',)
 
 
 
@@ -26,31 +38,31 @@ def home(request):
 
 def challenge_list(request):
     """
-    List of all challenges.
-    TODO: pagination
-    """    
-    context = {'slug': 'challenges'}
-    return render_to_response('challenge_list.html', context, RequestContext(request))
-
-def get_scoreboard(challenge, solution, username=None):
-    """
-    calculate scoreboard    
+    List of all challenges, newest first. Pages are keyed by the last
+    challenge of the previous page, so every page costs the same, and they
+    are cached until a challenge changes.
     """
-    # retrieve all users who have a correct solution for this challenge
-    sb_users = User.objects.filter(solution__challenge=challenge, solution__status=2)
-    # annotate one list with a sum of the set points
-    # and another with with a sumb of the bonus points
-    scoreboard = sb_users.annotate(score=Sum('solution__set__points')).order_by('id')
-    scoreboard_b = sb_users.annotate(score=Sum('solution__bonuses__points')).order_by('id')
-    for sa, sb in zip(scoreboard, scoreboard_b):
-        # add them together
-        if sb.score:            
-            sa.score += sb.score
-        # retrieve a list of this users solutions to link to
-        sa.solutions = sa.solution_set.filter(challenge=challenge, status=2).order_by('id')
+    try:
+        before = max(int(request.GET.get('before', 0)), 0)
+    except ValueError:
+        before = 0
+    try:
+        challenges, more = caching.get_challenge_page(before, CHALLENGE_PAGE)
+    except Challenge.DoesNotExist:
+        raise Http404
+
+    scores = caching.get_scores(request.user) if request.user.is_authenticated() else {}
+    for c in challenges:
+        c.score = scores.get(c.id, 0)
 
-    scoreboard = sorted(list(scoreboard), key=lambda x: x.score, reverse=True)
-    return scoreboard
+    context = {
+        'slug': 'challenges',
+        'challenges': challenges,
+        'size': 0,
+        'before': before,
+        'next': challenges[-1].id if more else None,
+    }
+    return render_to_response('challenge_list.html', context, RequestContext(request))
 
 def challenge(request, challenge=None):    
     """
@@ -61,71 +73,24 @@ def challenge(request, challenge=None):
     min_status = 1 if request.user.is_superuser else 2
     challenge = get_object_or_404(Challenge, id=challenge, status__gte=min_status)
 
-    # all sets that this challenge uses
-    sets = challenge.sets.all()
-    set_buttons = []
-
-    # retrive a list of solutions for the challenge and user
-    # also, within those solutions, determine the id of the highest completed set
-    if request.user.is_authenticated():
-        solutions = challenge.solution_set.filter(author=request.user).order_by('set')
-        max_set = solutions.filter(status=2).aggregate(Max('set'))['set__max'] or 0
-    else:
-        solutions = []
-        max_set = 0
-
-    # append data to each set to determine if it should be open or closed based on the users
-    # completion progress
-    for set in sets:
-        set.open = False
-    for set in sets:
-        set.open = True
-        if set.id > max_set:
-            break                    
-
-    # zipping sets and solutions together, generate a list of buttons to display along the right.
-    # there are different buttons for all sorts of state combinations
-    for set, sol in itertools.izip_longest(sets, solutions):
-        
-        if not request.user.is_authenticated():
-            b = buttons.LoginButton(challenge, set, sol)
-        
-        elif not sol and not set.open:            
-            b = buttons.LockedButton(challenge, set, sol)
-        
-        elif sol and sol.status == 2:            
-            b = buttons.CompletedButton(challenge, set, sol)
-
-        elif sol and sol.is_expired():
-            b = buttons.ExpiredButton(challenge, set, sol)
-
-        elif sol and set.time_limit > 0:
-            b = buttons.RunningButton(challenge, set, sol)
-
-        elif sol:            
-            b = buttons.RunningUnlimitedButton(challenge, set, sol)            
-    
-        else:
-            b = buttons.OpenButton(challenge, set, sol)            
-
-        set_buttons.append(b)
-        
+    progress = caching.get_progress(challenge, request.user)
+    set_buttons = buttons.get_buttons(challenge, request.user, progress)
 
     # get scoreboard for this challenge
     # additionally find MY score and store it specially
-    scoreboard = get_scoreboard(challenge, solution)
-    if request.user in scoreboard:
-        my_score = [x.score for x in scoreboard if x==request.user][0]
-    else:
-        my_score = 0
+    scoreboard = list(get_scoreboard(challenge))
+    my_scores = [x.total for x in scoreboard if x.user_id == request.user.id]
+    my_score = my_scores[0] if my_scores else 0
     
     context = {
         'slug': 'challenges',
         'challenge': challenge,
         'buttons': set_buttons,        
-        'bonuses': challenge.bonuses.all(),
+        'bonuses': caching.get_bonuses(challenge),
+        'earned': progress.earned,
         's_form': SolutionForm(),
         'scoreboard': scoreboard,
+        'scoreboard_version': get_scoreboard_version(challenge),
         'my_score': my_score,
     }
 
@@ -135,6 +100,46 @@ def challenge(request, challenge=None):
 
     return render_to_response('challenge.html', context, RequestContext(request))
 
+def get_scoreboard_version(challenge):
+    """
+    Changes whenever the scoreboard of a challenge changes.
+    """
+    # read from the same database as the scoreboard itself
+    with database.replica():
+        version = Score.objects.filter(challenge=challenge).aggregate(updated=Max('updated'), n=Count('id'))
+    updated = version['updated'].isoformat() if version['updated'] else ''
+    return '%s-%d' % (updated, version['n'])
+
+def challenge_state(request, challenge):
+    """
+    JSON state of a challenge page, so it can be updated in place. Only the
+    set buttons whose state differs from the one the page sent, and the
+    scoreboard if its version changed, are rendered.
+    """
+    challenge = get_object_or_404(Challenge, id=challenge, status=2)
+    data = {'sets': {}}
+
+    s_form = SolutionForm()
+    if not challenge.source_req:
+        s_form.fields.pop('source')
+
+    for b in buttons.get_buttons(challenge, request.user):
+        if request.GET.get('set-%d' % b.set.id) != b.state:
+            data['sets'][b.set.id] = {
+                'state': b.state,
+                'html': render_to_string('set_button.html', {'b': b, 'challenge': challenge, 's_form': s_form},
+                    RequestContext(request)),
+            }
+
+    version = get_scoreboard_version(challenge)
+    if request.GET.get('scoreboard') != version:
+        data['scoreboard'] = {
+            'version': version,
+            'html': render_to_string('scoreboard.html', {'challenge': challenge, 'scoreboard': get_scoreboard(challenge)}),
+        }
+
+    return HttpResponse(json.dumps(data), content_type='application/json')
+
 @login_required
 def solution_begin(request, challenge, set):
     """
@@ -159,27 +164,75 @@ def solution_begin(request, challenge, set):
         solution = Solution()
         solution.author = request.user
         solution.challenge = challenge
-        solution.set_id = int(set)       
-        output = solution.generate() # generate new input
-        solution.save()
+        solution.set_id = int(set)
+        regenerate = True
     else:
         solution = solutions[0]
-        if solution.is_expired() or not challenge.use_input_validation:
-            output = solution.generate() # generate new input
-            solution.save()
+        regenerate = solution.is_expired() or not challenge.use_input_validation or not solution.generated
+
+    # ajax requests get a job to poll, and download the input once it is ready
+    if request.is_ajax():
+        if regenerate and jobs.ASYNC_GENERATION:
+            job = jobs.enqueue(solution)
         else:
-            output = solution.input_gen
-        
-    filename = 'pq-p%d-%s-%d.in' % (
-        challenge.id,
-        solution.set.title.lower(),
-        solution.attempt
-    )
-
-    response = HttpResponse(output, mimetype='text/plain')
-    response['Content-Disposition'] = 'attachment; filename=%s' % filename
+            if regenerate:
+                pool.generate(solution) # generate new input
+                solution.save()
+            job = GenerationJob(solution=solution, status=2)
+        return job_response(challenge, job)
+
+    if regenerate:
+        pool.generate(solution) # generate new input
+        solution.save()
+
+    return input_response(request, solution)
+
+def input_response(request, solution):
+    """
+    Stream the generated input of a solution as a download. Stored inputs are
+    sent still compressed to clients that take gzip.
+    """
+    if solution.seed is None and solution.input_digest and serving.accepts_gzip(request):
+        return serving.serve_gzip(blobstore.path(solution.input_digest), filename=solution.get_input_filename())
+    response = StreamingHttpResponse(solution.iter_input(), mimetype='text/plain')
+    response['Content-Length'] = solution.input_size
+    response['Content-Disposition'] = 'attachment; filename=%s' % solution.get_input_filename()
     return response
 
+def job_response(challenge, job):
+    """
+    JSON status of a generation job.
+    """
+    data = {
+        'id': job.id,
+        'status': job.get_status_display().lower(),
+        'position': job.position(),
+        'url': reverse('pq.views.solution_job', args=[challenge.id, job.id]) if job.id else None,
+    }
+    if job.status == 2:
+        data['download'] = reverse('pq.views.solution_input', args=[challenge.id, job.solution.id])
+    return HttpResponse(json.dumps(data), content_type='application/json')
+
+@login_required
+def solution_job(request, challenge, job):
+    """
+    Poll the status of an input generation job.
+    """
+    challenge = get_object_or_404(Challenge, id=challenge)
+    job = get_object_or_404(GenerationJob, id=job, solution__challenge=challenge, solution__author=request.user)
+    return job_response(challenge, job)
+
+@login_required
+def solution_input(request, challenge, solution):
+    """
+    Download the generated input of a solution.
+    """
+    challenge = get_object_or_404(Challenge, id=challenge)
+    solution = get_object_or_404(Solution, id=solution, challenge=challenge, author=request.user)
+    if not solution.generated:
+        raise Http404
+    return input_response(request, solution)
+
 @login_required
 def solution_upload(request, challenge, solution):
     """
@@ -187,22 +240,27 @@ def solution_upload(request, challenge, solution):
     """
     # TODO: clobbering the variable with one of a different type is probably not the best
     challenge = get_object_or_404(Challenge, id=challenge)
-    solution = get_object_or_404(Solution, id=solution)
+    solution = get_object_or_404(Solution, id=solution, challenge=challenge, author=request.user)
     
     if challenge.status != 2:
         return HttpResponseRedirect(reverse('pq.views.challenge_list'))
 
-    if solution.is_expired():
+    if solution.is_expired() or not solution.generated:
         return HttpResponseRedirect(reverse('pq.views.challenge', args=[challenge.id]))
 
     if request.POST:
-        form = SolutionForm(request.POST, request.FILES, instance=solution)
+        digests = getattr(request, 'output_digests', {})
+        form = SolutionForm(request.POST, request.FILES, instance=solution,
+            output_digest=digests.get('output_user'))
         if form.is_valid():
             # valid and complete!
-            solution.status = 2
-            solution.submitted = datetime.now()
-            solution.apply_bonuses()
-            solution.save()
+            with transaction.commit_on_success():
+                solution.status = 2
+                solution.submitted = datetime.now()
+                solution.save()
+                bonuses.apply(solution)
+                update_score(solution.challenge, solution.author)
+            solution_completed.send(sender=Solution, solution=solution)
         else:
             for e in form.non_field_errors():
                 messages.add_message(request, messages.ERROR, e)
@@ -220,38 +278,66 @@ def solution(request, challenge, solution):
         return HttpResponseRedirect(reverse('pq.views.challenge', args=[challenge.id]))    
     # solutions = challenge.solution_set.order_by('id')
 
+    source_html = ''
+    if solution.source:
+        if not solution.source_digest:
+            solution.update_source_digest()
+        source_html = highlight.solution_html(solution)
+
     context = {
         'slug': 'challenges',
         'challenge': challenge,
         'solution': solution,
+        'source_html': source_html,
         # 'buttons': buttons,
         # 'solutions': challenge.solution_set.filter(status=2),
         # 'bonuses': Bonus.objects.all(),
         # 's_form': SolutionForm(),
-        'scoreboard': get_scoreboard(challenge, solution), 
+        'scoreboard': get_scoreboard(challenge),
         # 'my_score': my_score,        
     }
 
     return render_to_response('solution.html', context, RequestContext(request))
     
-def solution_raw(request, challenge, solution):
+def source_response(request, challenge, solution, download=False):
     """
-    View details of a single solution.
+    Serve the source of a solution, see pq.serving.
     """
     challenge = get_object_or_404(Challenge, id=challenge)
     solution = get_object_or_404(Solution, id=solution, challenge=challenge)
-    response = HttpResponse(solution.source, mimetype='text/plain')
-    return response
+    if not solution.source:
+        raise Http404
+    if not solution.source_digest:
+        solution.update_source_digest()
+    filename = os.path.basename(solution.source.name) if download else None
+    return serving.serve_file(request, solution.source.path, solution.source_digest, filename=filename)
+
+def solution_raw(request, challenge, solution):
+    """
+    View the source of a single solution.
+    """
+    return source_response(request, challenge, solution)
 
 def solution_download(request, challenge, solution):
     """
-    View details of a single solution.
-    """    
-    challenge = get_object_or_404(Challenge, id=challenge)
-    solution = get_object_or_404(Solution, id=solution, challenge=challenge)    
-    response = HttpResponse(solution.source, mimetype='text/plain')
-    response['Content-Disposition'] = 'attachment; filename=%s' % os.path.basename(solution.source.name)
-    return response
+    Download the source of a single solution.
+    """
+    return source_response(request, challenge, solution, download=True)
+
+def media(request, path):
+    """
+    Serve an uploaded file, see pq.serving. Generators, validators and
+    uploaded outputs are only for staff, and are not cached by proxies.
+    """
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except ValueError:
+        raise Http404
+    public = os.path.relpath(fullpath, settings.MEDIA_ROOT).split(os.sep)[0] in PUBLIC_MEDIA
+    if not os.path.isfile(fullpath) or not (public or request.user.is_staff):
+        raise Http404
+    content_type = mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+    return serving.serve_file(request, fullpath, content_type=content_type, public=public)
     
 def solution_delete(request, challenge, solution):
     challenge = get_object_or_404(Challenge, id=challenge)
@@ -275,16 +361,47 @@ def contribute(request):
     """
     return render_to_response('contribute.html', {'slug': 'contribute'}, RequestContext(request))
 
+def leaderboard(request):
+    """
+    Global leaderboard over all challenges.
+    """
+    try:
+        start = max(int(request.GET.get('start', 0)), 0)
+    except ValueError:
+        start = 0
+
+    context = {
+        'slug': 'leaderboard',
+        'rankings': get_leaderboard(start, LEADERBOARD_PAGE),
+        'start': start,
+        'previous': max(start - LEADERBOARD_PAGE, 0) if start else None,
+        'next': start + LEADERBOARD_PAGE,
+    }
+    if len(context['rankings']) < LEADERBOARD_PAGE:
+        context['next'] = None
+    return render_to_response('leaderboard.html', context, RequestContext(request))
+
 def user_profile(request, username=None):
     """
     User profile
     """
     if not username:
+        if not request.user.is_authenticated():
+            return HttpResponseRedirect(reverse('django.contrib.auth.views.login'))
         user = request.user
-        username = request.user.username
     else:
-        print username
         user = get_object_or_404(User, username=username)
 
-    # messages.add_message(request, messages.INFO, 'Welcome to proggitquiz, %s.' % username)
-    return HttpResponseRedirect(reverse('pq.views.home'))
+    try:
+        ranking = Ranking.objects.get(user=user)
+        ranking.rank = get_rank(ranking)
+    except Ranking.DoesNotExist:
+        ranking = None
+
+    context = {
+        'slug': 'profile',
+        'profile': user,
+        'ranking': ranking,
+        'scores': Score.objects.filter(user=user).select_related('challenge').order_by('-challenge__started'),
+    }
+    return render_to_response('profile.html', context, RequestContext(request))
@@ -0,0 +1,145 @@
+"""
+Persistent worker processes for generator and validator scripts.
+
+Starting a fresh interpreter for every script call costs more than most sets
+take to generate. A worker loads its script once and serves calls over a pipe
+until it has run WORKER_MAX_JOBS jobs or the script file changes on disk.
+
+Workers run under the sandbox memory and file size limits, and each call is
+held to the sandbox timeout and concurrency cap. CPU time is not limited by
+rlimit, since that would count the whole life of the worker; a runaway call
+is stopped by the timeout instead, which kills its worker.
+"""
+import json
+import os
+import threading
+import time
+from subprocess import Popen, PIPE
+from django.conf import settings
+from pq import sandbox
+
+WORKER_MAX_JOBS = getattr(settings, 'PQ_WORKER_MAX_JOBS', 100)
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scriptworker.py')
+
+
+class Worker(object):
+    """
+    A single worker process bound to one version of a script.
+    """
+    def __init__(self, path, max_jobs=WORKER_MAX_JOBS):
+        self.path = path
+        self.jobs_left = max_jobs
+        self.process = Popen(['python', WORKER_SCRIPT, path, '%d' % max_jobs],
+            stdin=PIPE, stdout=PIPE, close_fds=True,
+            preexec_fn=self.set_limits if sandbox.resource else None)
+
+    @staticmethod
+    def set_limits():
+        sandbox.set_limits(cpu_seconds=None)
+
+    def call(self, args, input='', timeout=sandbox.TIMEOUT):
+        """
+        Run the script once and return an ExecResult.
+        """
+        start = time.time()
+        timed_out = []
+        def on_timeout():
+            timed_out.append(True)
+            sandbox.kill(self.process)
+        timer = threading.Timer(timeout, on_timeout)
+        timer.start()
+        try:
+            header = json.dumps({'args': list(args), 'size': len(input)})
+            self.process.stdin.write(header + '\n')
+            self.process.stdin.write(input)
+            self.process.stdin.flush()
+            self.jobs_left -= 1
+
+            reply = self.process.stdout.readline()
+            if reply:
+                reply = json.loads(reply)
+                output = self.process.stdout.read(reply['size'])
+        except IOError:
+            reply = None
+        finally:
+            timer.cancel()
+        elapsed = time.time() - start
+
+        if not reply:
+            # the worker died, or was killed for running too long
+            self.jobs_left = 0
+            error = 'Timed out after %d seconds.' % timeout if timed_out else None
+            return sandbox.ExecResult(self.path, self.process.wait() or 1, '', elapsed,
+                timed_out=bool(timed_out), error=error)
+        return sandbox.ExecResult(self.path, reply['status'], output, elapsed,
+            cpu_time=reply.get('cpu'), peak_rss=reply.get('rss'), error=reply['error'])
+
+    def alive(self):
+        return self.jobs_left > 0 and self.process.poll() is None
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+
+class WorkerPool(object):
+    """
+    Idle workers keyed by script path and modification time.
+    """
+    def __init__(self, max_jobs=WORKER_MAX_JOBS):
+        self.max_jobs = max_jobs
+        self.idle = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, path):
+        key = (path, os.path.getmtime(path))
+        with self.lock:
+            # workers for an older version of the script are retired
+            for stale in [k for k in self.idle if k[0] == path and k != key]:
+                for worker in self.idle.pop(stale):
+                    worker.stop()
+            workers = self.idle.get(key, [])
+            while workers:
+                worker = workers.pop()
+                if worker.alive():
+                    return key, worker
+                worker.stop()
+        return key, Worker(path, self.max_jobs)
+
+    def release(self, key, worker):
+        if not worker.alive():
+            worker.stop()
+            return
+        with self.lock:
+            self.idle.setdefault(key, []).append(worker)
+
+    def execute(self, path, args=(), input=''):
+        """
+        Run a script in a worker and return an ExecResult.
+        """
+        with sandbox.slots:
+            key, worker = self.acquire(path)
+            try:
+                return worker.call(args, input)
+            except Exception:
+                worker.jobs_left = 0
+                raise
+            finally:
+                self.release(key, worker)
+
+    def run(self, path, args=(), input=''):
+        """
+        Run a script in a worker and return its output.
+        """
+        return self.execute(path, args, input).check()
+
+    def shutdown(self):
+        with self.lock:
+            for workers in self.idle.values():
+                for worker in workers:
+                    worker.stop()
+            self.idle = {}
+
+
+pool = WorkerPool()
@@ -18,6 +18,19 @@ DATABASES = {
         'PORT': '',                      # Set to empty string for default. Not used with sqlite3.
     }
 }
+# Reads of the scoreboards and challenge lists go to a 'replica' database if
+# there is one, see pq.database.
+DATABASE_ROUTERS = ['pq.database.ReplicaRouter']
+
+# The sidebar data is cached, see pq.caching. With several server processes,
+# use a shared backend such as FileBasedCache or memcached instead.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pq',
+    }
+}
+
 # Local time zone for this installation. Choices can be found here:
 # http://en.wikipedia.org/wiki/List_of_tz_zones_by_name
 # although not all choices may be available on all operating systems.
@@ -89,6 +102,8 @@ TEMPLATE_LOADERS = (
 )
 
 MIDDLEWARE_CLASSES = (
+    # time breakdown per request, see pq.profiling
+    'pq.profiling.ProfilingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -98,6 +113,13 @@ MIDDLEWARE_CLASSES = (
     # 'django.middleware.clickjacking.XFrameOptionsMiddleware',
 )
 
+# hash uploaded outputs while they are received, see pq.uploadhandlers
+FILE_UPLOAD_HANDLERS = (
+    'pq.uploadhandlers.OutputDigestUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+)
+
 ROOT_URLCONF = 'proggitquiz.urls'
 
 # Python dotted path to the WSGI application used by Django's runserver.
@@ -150,7 +172,10 @@ LOGGING = {
             'level': 'ERROR',
             'filters': ['require_debug_false'],
             'class': 'django.utils.log.AdminEmailHandler'
-        }
+        },
+        'null': {
+            'class': 'django.utils.log.NullHandler',
+        },
     },
     'loggers': {
         'django.request': {
@@ -158,6 +183,12 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': True,
         },
+        # one json line per request, point this at a real handler to use it
+        'pq.profiling': {
+            'handlers': ['null'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     }
 }
 